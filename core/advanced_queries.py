@@ -125,6 +125,39 @@ class AggregateFunction:
         else:
             return self.accumulator
     
+    def compute(self, values: List[Any]) -> Any:
+        """
+        Aggregate a whole column of values in one call.
+        
+        Gives the same result as add() for each value followed by
+        get_result(), but reduces with the builtin sum/max/min/len so the
+        per-value loop runs in C rather than through add().
+        
+        Args:
+            values: Column values (for COUNT(*), one entry per row)
+            
+        Returns:
+            Final aggregate value
+        """
+        if self.func_type == AggregateType.COUNT and self.column is None:
+            return len(values)
+        
+        present = [value for value in values if value is not None]
+        if self.func_type == AggregateType.COUNT:
+            return len(present)
+        if not present:
+            return None
+        
+        if self.func_type == AggregateType.SUM:
+            return sum(map(float, present))
+        elif self.func_type == AggregateType.AVG:
+            return sum(map(float, present)) / len(present)
+        elif self.func_type == AggregateType.MAX:
+            return max(present)
+        elif self.func_type == AggregateType.MIN:
+            return min(present)
+        return None
+    
     def __repr__(self) -> str:
         """String representation"""
         if self.column:
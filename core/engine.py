@@ -42,7 +42,7 @@ Future Enhancements:
     - Subquery execution
     - Query explain plans
 """
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from core.parser import SQLParser, StatementType, JoinType
 from core.storage import Storage
 from core.schema import Table
@@ -104,6 +104,8 @@ class QueryEngine:
             self.use_database(default_database)
 
         self.parser = SQLParser()
+        # SQL text -> PreparedStatement, oldest first (see prepare())
+        self._prepared: Dict[str, 'PreparedStatement'] = {}
 
     def use_database(self, name: str) -> Dict[str, Any]:
         if self.database_manager is None:
@@ -155,38 +157,218 @@ class QueryEngine:
         try:
             # Parse SQL statement
             parsed = self.parser.parse(sql)
-            stmt_type = parsed['type']
-            
-            # Dispatch to appropriate executor based on statement type
-            if stmt_type == StatementType.CREATE_DATABASE:
-                return self._execute_create_database(parsed)
-            elif stmt_type == StatementType.DROP_DATABASE:
-                return self._execute_drop_database(parsed)
-            elif stmt_type == StatementType.USE_DATABASE:
-                return self.use_database(parsed['database'])
-            elif stmt_type == StatementType.SHOW_DATABASES:
-                return self._execute_show_databases()
-            elif stmt_type == StatementType.SHOW_TABLES:
-                return self._execute_show_tables()
-            elif stmt_type == StatementType.CREATE_TABLE:
-                return self._execute_create_table(parsed)
-            elif stmt_type == StatementType.INSERT:
-                return self._execute_insert(parsed)
-            elif stmt_type == StatementType.SELECT:
-                return self._execute_select(parsed)
-            elif stmt_type == StatementType.UPDATE:
-                return self._execute_update(parsed)
-            elif stmt_type == StatementType.DELETE:
-                return self._execute_delete(parsed)
-            elif stmt_type == StatementType.CREATE_INDEX:
-                return self._execute_create_index(parsed)
-            else:
-                return {'success': False, 'error': 'Unsupported statement type'}
+            return self._execute_parsed(parsed)
         
         except Exception as e:
             # Return error without re-raising
             return {'success': False, 'error': str(e)}
 
+    def _execute_parsed(self, parsed: Dict[str, Any]) -> Dict[str, Any]:
+        """Dispatch an already-parsed statement to its executor (may raise)"""
+        stmt_type = parsed['type']
+        
+        # Dispatch to appropriate executor based on statement type
+        if stmt_type == StatementType.CREATE_DATABASE:
+            return self._execute_create_database(parsed)
+        elif stmt_type == StatementType.DROP_DATABASE:
+            return self._execute_drop_database(parsed)
+        elif stmt_type == StatementType.USE_DATABASE:
+            return self.use_database(parsed['database'])
+        elif stmt_type == StatementType.SHOW_DATABASES:
+            return self._execute_show_databases()
+        elif stmt_type == StatementType.SHOW_TABLES:
+            return self._execute_show_tables()
+        elif stmt_type == StatementType.CREATE_TABLE:
+            return self._execute_create_table(parsed)
+        elif stmt_type == StatementType.INSERT:
+            return self._execute_insert(parsed)
+        elif stmt_type == StatementType.SELECT:
+            return self._execute_select(parsed)
+        elif stmt_type == StatementType.UPDATE:
+            return self._execute_update(parsed)
+        elif stmt_type == StatementType.DELETE:
+            return self._execute_delete(parsed)
+        elif stmt_type == StatementType.CREATE_INDEX:
+            return self._execute_create_index(parsed)
+        else:
+            return {'success': False, 'error': 'Unsupported statement type'}
+
+    def prepare(self, sql: str) -> 'PreparedStatement':
+        """
+        Parse a statement with ? placeholders once for repeated execution.
+        
+        Placeholders stand for literal values (not table or column names) and
+        are bound positionally. Bound values are passed to storage as-is, so
+        quotes in strings need no escaping.
+        
+        Prepared statements are cached by SQL text (the parse does not depend
+        on the schema), so preparing the same statement again is a dict hit.
+        
+        Args:
+            sql: SQL statement using ? for each value
+            
+        Returns:
+            PreparedStatement that can be executed with different parameters
+            
+        Raises:
+            ValueError: If the statement cannot be parsed
+            
+        Example:
+            >>> stmt = engine.prepare("INSERT INTO users VALUES (?, ?)")
+            >>> stmt.execute((1, "O'Brien"))
+            >>> stmt.executemany([(2, 'Bob'), (3, 'Carol')])
+        """
+        cached = self._prepared.get(sql)
+        if cached is not None:
+            return cached
+        
+        # Swap each unquoted ? for a quoted marker literal so the regular
+        # parser runs once; the markers are replaced with values on execute.
+        pieces = []
+        param_count = 0
+        quote = None
+        for ch in sql:
+            if quote:
+                if ch == quote:
+                    quote = None
+            elif ch in ("'", '"'):
+                quote = ch
+            elif ch == '?':
+                ch = f"'{_PARAM_MARKER.format(param_count)}'"
+                param_count += 1
+            pieces.append(ch)
+        
+        parsed = self.parser.parse(''.join(pieces))
+        statement = PreparedStatement(self, parsed, param_count)
+        
+        if len(self._prepared) >= _PREPARED_CACHE_SIZE:
+            del self._prepared[next(iter(self._prepared))]
+        self._prepared[sql] = statement
+        return statement
+
+    def execute_many(self, statements) -> Dict[str, Any]:
+        """
+        Execute a batch of SQL statements, all or nothing.
+        
+        Every statement is parsed before any of them runs, and the batch runs
+        inside one transaction, so each changed table is written once at the
+        end. The first failing statement stops the batch and discards the
+        row changes of the statements before it (as with transaction(),
+        schema changes are not rolled back).
+        
+        Args:
+            statements: List of SQL statements, or one script string with
+                statements separated by semicolons
+                
+        Returns:
+            Result dictionary with the per-statement 'results' and the total
+            'rows_affected'; on failure, 'error' names the failing statement
+            
+        Example:
+            >>> engine.execute_many([
+            ...     "CREATE TABLE users (id INT PRIMARY KEY, name VARCHAR(50))",
+            ...     "INSERT INTO users VALUES (1, 'Alice')",
+            ...     "INSERT INTO users VALUES (2, 'Bob')",
+            ... ])
+        """
+        if isinstance(statements, str):
+            statements = _split_statements(statements)
+        
+        parsed_statements = []
+        for i, sql in enumerate(statements, 1):
+            try:
+                parsed_statements.append(self.parser.parse(sql))
+            except Exception as e:
+                return {'success': False, 'error': f"Statement {i}: {e}"}
+        
+        results = []
+        try:
+            with self.transaction():
+                for i, parsed in enumerate(parsed_statements, 1):
+                    try:
+                        result = self._execute_parsed(parsed)
+                    except Exception as e:
+                        result = {'success': False, 'error': str(e)}
+                    if not result['success']:
+                        # Abort the transaction so earlier statements roll back
+                        raise ValueError(f"Statement {i}: {result['error']}")
+                    results.append(result)
+        except Exception as e:
+            return {'success': False, 'error': str(e)}
+        
+        total = sum(result.get('rows_affected', 0) for result in results)
+        return {
+            'success': True,
+            'message': f"{len(results)} statements executed",
+            'results': results,
+            'rows_affected': total
+        }
+
+    def copy_from(self, table_name: str, columns: Optional[List[str]], rows) -> Dict[str, Any]:
+        """
+        Insert already-typed row tuples without going through the SQL parser.
+        
+        Like COPY FROM in other databases: the rows are validated and
+        constrained exactly as an INSERT would be, but no SQL text is built
+        or parsed. All rows are inserted in one storage call, so the table
+        is written once and a bad row rejects the whole load.
+        
+        Args:
+            table_name: Table to load into
+            columns: Column names matching each tuple, or None for all
+                columns in table order
+            rows: Iterable of value tuples
+            
+        Returns:
+            Result dictionary, as for INSERT
+            
+        Example:
+            >>> engine.copy_from('users', ['id', 'name'], [(1, 'Alice'), (2, 'Bob')])
+        """
+        rows = [list(row) for row in rows]
+        if not rows:
+            return {'success': True, 'message': '0 rows inserted', 'rows_affected': 0}
+        
+        try:
+            return self._execute_insert({
+                'type': StatementType.INSERT,
+                'table': table_name,
+                'columns': list(columns) if columns else None,
+                'values': rows[0],
+                'rows': rows
+            })
+        except Exception as e:
+            return {'success': False, 'error': str(e)}
+
+    def insert_row(self, table_name: str, values: Tuple) -> Dict[str, Any]:
+        """
+        Insert one row of values in table column order, skipping the parser.
+
+        Example:
+            >>> engine.insert_row('users', (1, 'Alice'))
+        """
+        return self.copy_from(table_name, None, [values])
+
+    def insert_rows(self, table_name: str, rows) -> Dict[str, Any]:
+        """
+        Insert value tuples in table column order, skipping the parser.
+
+        Shorthand for copy_from(table_name, None, rows): every row is checked
+        like an INSERT and a bad row rejects the whole batch.
+
+        Example:
+            >>> engine.insert_rows('users', [(1, 'Alice'), (2, 'Bob')])
+        """
+        return self.copy_from(table_name, None, rows)
+
+    def transaction(self):
+        """Context manager that defers table writes until the block exits.
+
+        Every table changed inside the block is persisted once at the end; if
+        the block raises, the changes are discarded. See Storage.transaction.
+        """
+        return self.storage.transaction()
+
     def explain(self, sql: str) -> Dict[str, Any]:
         """Return a structured execution plan for a SQL statement.
 
@@ -394,24 +576,35 @@ class QueryEngine:
         if not table:
             return {'success': False, 'error': f"Table {table_name} does not exist"}
         
-        # Build row dict
+        # Build row dicts (one per VALUES group)
+        value_rows = parsed.get('rows') or [parsed['values']]
         if parsed['columns']:
             # Columns specified
-            if len(parsed['columns']) != len(parsed['values']):
-                return {'success': False, 'error': 'Column count does not match value count'}
-            row = dict(zip(parsed['columns'], parsed['values']))
+            column_names = parsed['columns']
+            count_error = 'Column count does not match value count'
         else:
             # No columns specified - use all columns in order
-            if len(table.columns) != len(parsed['values']):
-                return {'success': False, 'error': 'Value count does not match table column count'}
-            row = dict(zip([col.name for col in table.columns], parsed['values']))
+            column_names = [col.name for col in table.columns]
+            count_error = 'Value count does not match table column count'
         
-        row_id = self.storage.insert_row(table_name, row)
+        rows = []
+        for values in value_rows:
+            if len(column_names) != len(values):
+                return {'success': False, 'error': count_error}
+            rows.append(dict(zip(column_names, values)))
+        
+        # Single storage call: one disk write, all-or-nothing for multi-row VALUES
+        row_ids = self.storage.insert_rows(table_name, rows)
+        
+        if len(row_ids) == 1:
+            message = f"Row inserted with ID {row_ids[0]}"
+        else:
+            message = f"{len(row_ids)} rows inserted"
         
         return {
             'success': True,
-            'message': f"Row inserted with ID {row_id}",
-            'rows_affected': 1
+            'message': message,
+            'rows_affected': len(row_ids)
         }
     
     def _execute_select(self, parsed: Dict[str, Any]) -> Dict[str, Any]:
@@ -475,7 +668,14 @@ class QueryEngine:
         """Execute SELECT with JOINs"""
         # Get main table rows
         main_table = parsed['table']
-        main_rows = self.storage.select_rows(main_table, parsed['where'])
+        where = parsed['where']
+        
+        # A WHERE on the main table alone filters it before the joins; one
+        # that names a joined table is checked on the joined rows instead
+        joined_where = None
+        if where and self._where_tables(where) - {main_table}:
+            joined_where, where = where, None
+        main_rows = self.storage.select_rows(main_table, where)
         
         # Prefix columns with table name
         main_rows = [self._prefix_columns(row, main_table) for row in main_rows]
@@ -494,6 +694,10 @@ class QueryEngine:
             elif join_type == JoinType.LEFT:
                 result_rows = self._left_join_index_aware(result_rows, join_table, join_condition)
         
+        if joined_where:
+            result_rows = [row for row in result_rows
+                           if self._matches_joined_row(row, joined_where, main_table)]
+        
         # Earlier projection before sorting (keep ORDER BY column if needed)
         if parsed['columns'] != ['*'] and parsed['order_by']:
             requested = parsed['columns']
@@ -600,7 +804,11 @@ class QueryEngine:
         - HAVING clause for filtering aggregated groups
         """
         table_name = parsed['table']
-        rows = self.storage.select_rows(table_name, parsed['where'])
+        where = parsed['where']
+        having = parsed['having']
+        if having and parsed['group_by']:
+            where, having = self._push_down_having(where, having, parsed['group_by'])
+        rows = self.storage.select_rows(table_name, where)
         
         # Parse aggregate functions
         agg_funcs = []
@@ -616,17 +824,7 @@ class QueryEngine:
         # If no GROUP BY, compute aggregates on all rows
         if not parsed['group_by']:
             result_row = {}
-            for agg_info in agg_funcs:
-                agg = AggregateFunction(agg_info['type'])
-                for row in rows:
-                    if agg_info['column']:
-                        value = row.get(agg_info['column'])
-                        if value is not None:
-                            agg.add(value)
-                    else:
-                        # COUNT(*)
-                        agg.add(1)
-                result_row[agg_info['alias']] = agg.get_result()
+            self._compute_aggregates(rows, agg_funcs, result_row)
             
             # Add any selected columns (if not aggregated)
             if parsed['columns'] != ['*'] and not all(col in [a['alias'] for a in agg_funcs] for col in parsed['columns']):
@@ -642,14 +840,18 @@ class QueryEngine:
                 'count': 1
             }
         
-        # GROUP BY: group rows by specified columns
-        groups = {}
+        # GROUP BY: hash-group rows by the GROUP BY columns in one pass
+        # (one dict probe per row; no sorting, groups keep first-seen order)
+        group_by = parsed['group_by']
+        groups: Dict[tuple, List[Dict]] = {}
+        get_group = groups.get
         for row in rows:
-            # Create group key from GROUP BY columns
-            group_key = tuple(row.get(col) for col in parsed['group_by'])
-            if group_key not in groups:
-                groups[group_key] = []
-            groups[group_key].append(row)
+            group_key = tuple(map(row.get, group_by))
+            group_rows = get_group(group_key)
+            if group_rows is None:
+                groups[group_key] = [row]
+            else:
+                group_rows.append(row)
         
         # Compute aggregates for each group
         result_rows = []
@@ -657,29 +859,19 @@ class QueryEngine:
             result_row = {}
             
             # Add GROUP BY columns to result
-            for i, col in enumerate(parsed['group_by']):
+            for i, col in enumerate(group_by):
                 result_row[col] = group_key[i]
             
             # Compute aggregates for this group
-            for agg_info in agg_funcs:
-                agg = AggregateFunction(agg_info['type'])
-                for row in group_rows:
-                    if agg_info['column']:
-                        value = row.get(agg_info['column'])
-                        if value is not None:
-                            agg.add(value)
-                    else:
-                        # COUNT(*)
-                        agg.add(1)
-                result_row[agg_info['alias']] = agg.get_result()
+            self._compute_aggregates(group_rows, agg_funcs, result_row)
             
             result_rows.append(result_row)
         
         # Apply HAVING clause if present
-        if parsed['having']:
+        if having:
             filtered_rows = []
             for row in result_rows:
-                if self._evaluate_having(row, parsed['having'], agg_funcs):
+                if self._evaluate_having(row, having, agg_funcs):
                     filtered_rows.append(row)
             result_rows = filtered_rows
         
@@ -697,14 +889,86 @@ class QueryEngine:
             'count': len(result_rows)
         }
     
+    def _compute_aggregates(self, rows: List[Dict], agg_funcs: List[Dict], result_row: Dict[str, Any]):
+        """Store each aggregate over rows in result_row under its alias.
+
+        Each aggregated column is pulled out of the rows once and reduced in
+        a single AggregateFunction.compute() call.
+        """
+        for agg_info in agg_funcs:
+            column = agg_info['column']
+            if column:
+                values = [row.get(column) for row in rows]
+            else:
+                # COUNT(*) counts rows
+                values = rows
+            agg = AggregateFunction(agg_info['type'], column)
+            result_row[agg_info['alias']] = agg.compute(values)
+    
+    def _push_down_having(self, where: Optional[Dict[str, Any]], having: Dict[str, Any],
+                          group_by: List[str]) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]:
+        """
+        Move HAVING terms that only test a GROUP BY column into WHERE.
+        
+        For an AND-only HAVING, every `group_column = value` term filters
+        whole groups, so it can filter the input rows instead and those rows
+        are never aggregated. Only equality is moved: it treats NULL the same
+        way in both clauses. Callers must not use this without GROUP BY,
+        where HAVING applies to the single all-rows group.
+        
+        Returns:
+            Tuple of (new WHERE condition, remaining HAVING condition or None)
+        """
+        if 'conditions' in having:
+            if any(op != 'AND' for op in having['operators']):
+                return where, having
+            terms = having['conditions']
+        else:
+            terms = [having]
+        
+        pushed = []
+        kept = []
+        for term in terms:
+            if 'column' in term and term['operator'] == '=' and term['column'] in group_by:
+                pushed.append(term)
+            else:
+                kept.append(term)
+        if not pushed:
+            return where, having
+        
+        if where is not None:
+            pushed.insert(0, where)
+        if len(pushed) == 1:
+            where = pushed[0]
+        else:
+            where = {'conditions': pushed, 'operators': ['AND'] * (len(pushed) - 1)}
+        
+        if not kept:
+            having = None
+        elif len(kept) == 1:
+            having = kept[0]
+        else:
+            having = {'conditions': kept, 'operators': ['AND'] * (len(kept) - 1)}
+        return where, having
+    
     def _evaluate_having(self, row: Dict[str, Any], having: Dict[str, Any], agg_funcs: List[Dict]) -> bool:
         """
         Evaluate HAVING clause on aggregated row.
         Similar to WHERE evaluation but operates on aggregate results.
         
         The HAVING column may be an aggregate function like 'SUM(total)',
-        which needs to be mapped to its alias in the result row.
+        which needs to be mapped to its alias in the result row. Terms joined
+        with AND/OR are combined left to right, as in WHERE.
         """
+        if 'conditions' in having:
+            result = self._evaluate_having(row, having['conditions'][0], agg_funcs)
+            for op, term in zip(having['operators'], having['conditions'][1:]):
+                if op == 'AND':
+                    result = result and self._evaluate_having(row, term, agg_funcs)
+                elif op == 'OR':
+                    result = result or self._evaluate_having(row, term, agg_funcs)
+            return result
+        
         column = having['column']
         operator = having['operator']
         value = having['value']
@@ -783,6 +1047,38 @@ class QueryEngine:
         
         return result
     
+    def _where_tables(self, condition: Dict[str, Any]) -> set:
+        """Table qualifiers used by the columns of a WHERE condition tree"""
+        if 'conditions' in condition:
+            tables = set()
+            for cond in condition['conditions']:
+                tables |= self._where_tables(cond)
+            return tables
+        qualifier, _, _ = condition['column'].rpartition('.')
+        return {qualifier} if qualifier else set()
+    
+    def _matches_joined_row(self, row: Dict[str, Any], condition: Dict[str, Any], main_table: str) -> bool:
+        """Check a WHERE condition against a joined row of table-prefixed columns"""
+        if 'conditions' in condition:
+            results = [self._matches_joined_row(row, cond, main_table) for cond in condition['conditions']]
+            result = results[0]
+            for i, op in enumerate(condition['operators']):
+                if op == 'AND':
+                    result = result and results[i + 1]
+                elif op == 'OR':
+                    result = result or results[i + 1]
+            return result
+        
+        column = condition['column']
+        if '.' not in column:
+            # Unqualified columns belong to the main table
+            column = f"{main_table}.{column}"
+        table_name, _, name = column.partition('.')
+        if column not in row or table_name not in self.storage.tables:
+            return False
+        # Compare with the storage rules, typed by that table's column definition
+        return self.storage._matches_condition({name: row[column]}, {**condition, 'column': name}, table_name)
+    
     def _prefix_columns(self, row: Dict[str, Any], table_name: str) -> Dict[str, Any]:
         """Prefix column names with table name"""
         return {f"{table_name}.{col}": val for col, val in row.items()}
@@ -877,3 +1173,120 @@ class QueryEngine:
             'message': f"Index '{index_name}' created on {table_name}({', '.join(columns)})",
             'rows_affected': 0
         }
+
+
+_PARAM_MARKER = '\x00param{}\x00'
+
+# Prepared statements kept per engine
+_PREPARED_CACHE_SIZE = 256
+
+
+def _split_statements(script: str) -> List[str]:
+    """Split a script on semicolons outside quoted strings, dropping blanks"""
+    statements = []
+    pieces = []
+    quote = None
+    for ch in script:
+        if quote:
+            if ch == quote:
+                quote = None
+        elif ch in ("'", '"'):
+            quote = ch
+        elif ch == ';':
+            statements.append(''.join(pieces))
+            pieces = []
+            continue
+        pieces.append(ch)
+    statements.append(''.join(pieces))
+    return [sql.strip() for sql in statements if sql.strip()]
+
+
+class PreparedStatement:
+    """
+    A parsed SQL statement with ? placeholders, created by QueryEngine.prepare().
+    
+    Executing a prepared statement skips SQL parsing: the parameters are
+    substituted into a copy of the parsed statement and dispatched directly.
+    
+    Attributes:
+        engine: QueryEngine the statement runs against
+        param_count: Number of ? placeholders in the statement
+    """
+    
+    def __init__(self, engine: QueryEngine, parsed: Dict[str, Any], param_count: int):
+        self.engine = engine
+        self.param_count = param_count
+        self._parsed = parsed
+        self._markers = {_PARAM_MARKER.format(i): i for i in range(param_count)}
+    
+    def execute(self, params: Tuple = ()) -> Dict[str, Any]:
+        """
+        Execute the statement with one set of parameters.
+        
+        Args:
+            params: Sequence of values, one per placeholder
+            
+        Returns:
+            Result dictionary, as returned by QueryEngine.execute()
+        """
+        try:
+            return self.engine._execute_parsed(self._bind(params))
+        except Exception as e:
+            return {'success': False, 'error': str(e)}
+    
+    def executemany(self, seq_of_params: List[Tuple]) -> Dict[str, Any]:
+        """
+        Execute the statement once per parameter set, all or nothing.
+        
+        A single-row INSERT is turned into one multi-row insert; other
+        statements run inside a transaction so the affected tables are
+        written once. If any execution fails, none of the changes are kept.
+        
+        Args:
+            seq_of_params: Iterable of parameter sequences
+            
+        Returns:
+            Result dictionary with the total 'rows_affected'
+        """
+        seq_of_params = list(seq_of_params)
+        if not seq_of_params:
+            return {'success': True, 'message': '0 rows affected', 'rows_affected': 0}
+        
+        try:
+            if self._parsed['type'] == StatementType.INSERT and len(self._parsed['rows']) == 1:
+                rows = [self._bind(params)['values'] for params in seq_of_params]
+                parsed = dict(self._parsed, values=rows[0], rows=rows)
+                return self.engine._execute_parsed(parsed)
+            
+            total = 0
+            with self.engine.transaction():
+                for params in seq_of_params:
+                    result = self.engine._execute_parsed(self._bind(params))
+                    if not result['success']:
+                        # Abort the transaction so earlier executions roll back
+                        raise ValueError(result['error'])
+                    total += result.get('rows_affected', 0)
+            return {'success': True, 'message': f"{total} rows affected", 'rows_affected': total}
+        
+        except Exception as e:
+            return {'success': False, 'error': str(e)}
+    
+    def _bind(self, params: Tuple) -> Dict[str, Any]:
+        """Return a copy of the parsed statement with markers replaced by params"""
+        if len(params) != self.param_count:
+            raise ValueError(
+                f"Statement expects {self.param_count} parameters, got {len(params)}"
+            )
+        return self._substitute(self._parsed, params)
+    
+    def _substitute(self, node: Any, params: Tuple) -> Any:
+        if isinstance(node, str):
+            index = self._markers.get(node)
+            return node if index is None else params[index]
+        if isinstance(node, dict):
+            return {key: self._substitute(value, params) for key, value in node.items()}
+        if isinstance(node, list):
+            return [self._substitute(value, params) for value in node]
+        if isinstance(node, tuple):
+            return tuple(self._substitute(value, params) for value in node)
+        return node
@@ -183,7 +183,9 @@ class BTreeIndex:
             return []
         
         key = self._normalize_key(key)
-        return self._search_node(self.root, key)
+        results = []
+        self._search_range_node(self.root, key, key, results)
+        return results
     
     def search_range(self, min_key: Any = None, max_key: Any = None) -> List[int]:
         """
@@ -289,54 +291,46 @@ class BTreeIndex:
         parent.keys.insert(index, mid_key)
         parent.children.insert(index + 1, new_child)
     
-    def _search_node(self, node: BTreeNode, key: Any) -> List[int]:
-        """Search for key in a node"""
-        i = 0
-        while i < len(node.keys) and key > node.keys[i]:
-            i += 1
-        
-        if i < len(node.keys) and key == node.keys[i]:
-            if node.is_leaf:
-                return [node.values[i]]
-            else:
-                # Continue searching in child
-                return self._search_node(node.children[i], key)
-        
-        if node.is_leaf:
-            return []
-        else:
-            return self._search_node(node.children[i], key)
-    
     def _search_range_node(self, node: BTreeNode, min_key: Any, max_key: Any, results: List[int]):
-        """Search for keys in range in a node"""
+        """Search for keys in range in a node.
+
+        Leaf splits copy the middle key up and equal keys may sit on both
+        sides of a separator, so child i can hold keys from keys[i-1] up to
+        and including keys[i]. Only children overlapping the range are visited.
+        """
         if node.is_leaf:
-            for i, key in enumerate(node.keys):
+            for key, row_id in zip(node.keys, node.values):
                 if (min_key is None or key >= min_key) and (max_key is None or key <= max_key):
-                    results.append(node.values[i])
-        else:
-            for i, key in enumerate(node.keys):
-                if min_key is None or key >= min_key:
-                    self._search_range_node(node.children[i], min_key, max_key, results)
-                
-                if (min_key is None or key >= min_key) and (max_key is None or key <= max_key):
-                    # Key itself might have corresponding values in next child
-                    pass
-            
-            # Check last child
-            if len(node.children) > len(node.keys):
-                self._search_range_node(node.children[-1], min_key, max_key, results)
+                    results.append(row_id)
+            return
+
+        keys = node.keys
+        for i, child in enumerate(node.children):
+            if min_key is not None and i < len(keys) and keys[i] < min_key:
+                continue
+            if max_key is not None and i > 0 and keys[i - 1] > max_key:
+                break
+            self._search_range_node(child, min_key, max_key, results)
     
-    def _delete_from_node(self, node: BTreeNode, key: Any, row_id: int):
-        """Delete key from node (simplified implementation)"""
+    def _delete_from_node(self, node: BTreeNode, key: Any, row_id: int) -> bool:
+        """Delete one (key, row_id) entry from the leaves (simplified: no rebalancing)"""
         if node.is_leaf:
-            try:
-                idx = node.keys.index(key)
-                if node.values[idx] == row_id:
+            for idx, (existing, value) in enumerate(zip(node.keys, node.values)):
+                if existing == key and value == row_id:
                     node.keys.pop(idx)
                     node.values.pop(idx)
-            except (ValueError, IndexError):
-                pass
+                    return True
+            return False
 
+        keys = node.keys
+        for i, child in enumerate(node.children):
+            if i < len(keys) and keys[i] < key:
+                continue
+            if i > 0 and keys[i - 1] > key:
+                break
+            if self._delete_from_node(child, key, row_id):
+                return True
+        return False
 
 @dataclass(frozen=True)
 class IndexDefinition:
@@ -443,6 +437,22 @@ class IndexManager:
             if new_key is not None:
                 definition.index.insert(new_key, row_id)
 
+    def rebuild(self, rows: Iterable[dict]):
+        """Drop every index's contents and rebuild them from the given rows.
+
+        Index names and column definitions are preserved; only the B-trees
+        are replaced. Used when every row changes at once, e.g. after a
+        table is emptied.
+        """
+        fresh: Dict[Tuple[str, ...], IndexDefinition] = {}
+        for cols, definition in self._by_columns.items():
+            fresh[cols] = IndexDefinition(name=definition.name, columns=cols, index=BTreeIndex(",".join(cols)))
+        self._by_name = {name: fresh[definition.columns] for name, definition in self._by_name.items()}
+        self._by_columns = fresh
+
+        for row in rows:
+            self.insert(row, row['_row_id'])
+
     def _build_key(self, row: dict, columns: Tuple[str, ...]) -> Optional[Any]:
         values = []
         for col in columns:
@@ -17,8 +17,8 @@ Parser Architecture:
     5. Output: Dictionary structure for query engine
 
 Supported SQL Features:
-    - CREATE TABLE with column constraints
-    - INSERT with columns or values-only
+    - CREATE TABLE with column constraints and table-level FOREIGN KEY
+    - INSERT with columns or values-only, single or multi-row VALUES
     - SELECT with WHERE, ORDER BY, LIMIT, and JOINs
     - UPDATE with SET and WHERE clauses
     - DELETE with WHERE clauses
@@ -36,6 +36,61 @@ from enum import Enum
 from core.types import DataType, Column
 
 
+# Patterns are compiled once at import instead of on every parse() call.
+# Table names may be qualified with a database name (db.table).
+_QUALIFIED_NAME = r'[A-Za-z_][A-Za-z0-9_]*(?:\.[A-Za-z_][A-Za-z0-9_]*)?'
+_JOIN_KEYWORD = r'(?:INNER\s+JOIN|LEFT\s+JOIN|JOIN)'
+
+_CREATE_DATABASE_RE = re.compile(r'CREATE DATABASE\s+(\w+)$', re.IGNORECASE)
+_DROP_DATABASE_RE = re.compile(r'DROP DATABASE\s+(\w+)$', re.IGNORECASE)
+_USE_DATABASE_RE = re.compile(r'USE\s+(\w+)$', re.IGNORECASE)
+_CREATE_TABLE_RE = re.compile(rf'CREATE TABLE\s+({_QUALIFIED_NAME})\s*\((.*)\)', re.IGNORECASE | re.DOTALL)
+_FOREIGN_KEY_START_RE = re.compile(r'FOREIGN\s+KEY\b', re.IGNORECASE)
+_TABLE_FOREIGN_KEY_RE = re.compile(
+    rf'FOREIGN\s+KEY\s*\(\s*(\w+)\s*\)\s*'
+    rf'REFERENCES\s+({_QUALIFIED_NAME})\s*\(\s*(\w+)\s*\)'
+    r'(?:\s+ON\s+DELETE\s+(RESTRICT|CASCADE|SET\s+NULL))?\s*$',
+    re.IGNORECASE,
+)
+_TYPE_LENGTH_RE = re.compile(r'(\w+)\((\d+)\)')
+_REFERENCES_RE = re.compile(
+    rf'REFERENCES\s+({_QUALIFIED_NAME})\s*\((\w+)\)'
+    r'(?:\s+ON\s+DELETE\s+(RESTRICT|CASCADE|SET\s+NULL)\b)?',
+    re.IGNORECASE,
+)
+_GENERATED_RE = re.compile(r'(?:GENERATED\s+ALWAYS\s+)?AS\s*\((.+?)\)\s+VIRTUAL\b', re.IGNORECASE | re.DOTALL)
+_INSERT_RE = re.compile(
+    rf'INSERT INTO\s+({_QUALIFIED_NAME})\s*(?:\((.*?)\))?\s*VALUES\s*(\(.*\))',
+    re.IGNORECASE | re.DOTALL,
+)
+_AGGREGATE_RE = re.compile(r'(COUNT|SUM|AVG|MAX|MIN)\s*\(\s*(.+?)\s*\)', re.IGNORECASE)
+_TABLE_NAME_RE = re.compile(rf'^({_QUALIFIED_NAME})')
+_JOIN_KEYWORD_RE = re.compile(rf'\b{_JOIN_KEYWORD}\b', re.IGNORECASE)
+_JOIN_CLAUSE_RE = re.compile(
+    rf'\b({_JOIN_KEYWORD})\b\s+({_QUALIFIED_NAME})\s+ON\s+(.+?)(?=(?:\s+{_JOIN_KEYWORD}\b)|$)',
+    re.IGNORECASE | re.DOTALL,
+)
+_JOIN_CONDITION_RE = re.compile(r'([\w.]+)\s*=\s*([\w.]+)')
+_LOGICAL_SPLIT_RE = re.compile(r'\s+(AND|OR)\s+', re.IGNORECASE)
+_CONDITION_OPERATORS = ['<=', '>=', '!=', '=', '<', '>', 'LIKE']
+_CONDITION_SPLIT_RES = {
+    op: re.compile(f'\\s*{re.escape(op)}\\s*', re.IGNORECASE) for op in _CONDITION_OPERATORS
+}
+_UPDATE_RE = re.compile(
+    rf'UPDATE\s+({_QUALIFIED_NAME})\s+SET\s+(.+?)(?:\s+WHERE\s+(.+))?$',
+    re.IGNORECASE | re.DOTALL,
+)
+_ASSIGNMENT_RE = re.compile(r'(\w+)\s*=\s*(.+)')
+_DELETE_RE = re.compile(
+    rf'DELETE FROM\s+({_QUALIFIED_NAME})(?:\s+WHERE\s+(.+))?$',
+    re.IGNORECASE | re.DOTALL,
+)
+_CREATE_INDEX_RE = re.compile(
+    rf'CREATE INDEX\s+(\w+)\s+ON\s+({_QUALIFIED_NAME})\s*\((.*?)\)\s*$',
+    re.IGNORECASE,
+)
+
+
 class StatementType(Enum):
     """
     Enumeration of supported SQL statement types.
@@ -167,19 +222,19 @@ class SQLParser:
             )
 
     def _parse_create_database(self, sql: str) -> Dict[str, Any]:
-        match = re.match(r'CREATE DATABASE\s+(\w+)$', sql.strip(), re.IGNORECASE)
+        match = _CREATE_DATABASE_RE.match(sql.strip())
         if not match:
             raise ValueError("Invalid CREATE DATABASE syntax. Expected: CREATE DATABASE db_name")
         return {'type': StatementType.CREATE_DATABASE, 'database': match.group(1)}
 
     def _parse_drop_database(self, sql: str) -> Dict[str, Any]:
-        match = re.match(r'DROP DATABASE\s+(\w+)$', sql.strip(), re.IGNORECASE)
+        match = _DROP_DATABASE_RE.match(sql.strip())
         if not match:
             raise ValueError("Invalid DROP DATABASE syntax. Expected: DROP DATABASE db_name")
         return {'type': StatementType.DROP_DATABASE, 'database': match.group(1)}
 
     def _parse_use_database(self, sql: str) -> Dict[str, Any]:
-        match = re.match(r'USE\s+(\w+)$', sql.strip(), re.IGNORECASE)
+        match = _USE_DATABASE_RE.match(sql.strip())
         if not match:
             raise ValueError("Invalid USE syntax. Expected: USE db_name")
         return {'type': StatementType.USE_DATABASE, 'database': match.group(1)}
@@ -214,7 +269,7 @@ class SQLParser:
             )
         """
         # Pattern: CREATE TABLE table_name (column_definitions)
-        match = re.match(r'CREATE TABLE\s+([A-Za-z_][A-Za-z0-9_]*(?:\.[A-Za-z_][A-Za-z0-9_]*)?)\s*\((.*)\)', sql, re.IGNORECASE | re.DOTALL)
+        match = _CREATE_TABLE_RE.match(sql)
         if not match:
             raise ValueError(
                 "Invalid CREATE TABLE syntax. "
@@ -235,6 +290,7 @@ class SQLParser:
     def _parse_column_definitions(self, columns_str: str) -> List[Column]:
         """Parse column definitions"""
         columns = []
+        table_foreign_keys = []
         
         # Split by commas (but not within parentheses)
         col_defs = self._split_by_comma(columns_str)
@@ -244,6 +300,15 @@ class SQLParser:
             if not col_def:
                 continue
             
+            # Table-level constraint: FOREIGN KEY (column) REFERENCES table(column)
+            #                         [ON DELETE (RESTRICT|CASCADE|SET NULL)]
+            if _FOREIGN_KEY_START_RE.match(col_def):
+                fk_match = _TABLE_FOREIGN_KEY_RE.match(col_def)
+                if not fk_match:
+                    raise ValueError(f"Invalid FOREIGN KEY constraint: {col_def}")
+                table_foreign_keys.append(fk_match.groups())
+                continue
+            
             # Parse: column_name data_type [(length)] [PRIMARY KEY] [UNIQUE] [NOT NULL]
             #        [REFERENCES table(column) [ON DELETE (RESTRICT|CASCADE|SET NULL)]]
             #        [GENERATED ALWAYS AS (expr) VIRTUAL]
@@ -257,7 +322,7 @@ class SQLParser:
             # Handle VARCHAR(n)
             length = None
             if '(' in data_type_str:
-                match = re.match(r'(\w+)\((\d+)\)', data_type_str)
+                match = _TYPE_LENGTH_RE.match(data_type_str)
                 if match:
                     data_type_str = match.group(1)
                     length = int(match.group(2))
@@ -278,12 +343,7 @@ class SQLParser:
             foreign_key = None
             foreign_key_on_delete = None
             if 'REFERENCES' in col_def_upper:
-                ref_match = re.search(
-                    r'REFERENCES\s+([A-Za-z_][A-Za-z0-9_]*(?:\.[A-Za-z_][A-Za-z0-9_]*)?)\s*\((\w+)\)'
-                    r'(?:\s+ON\s+DELETE\s+(RESTRICT|CASCADE|SET\s+NULL))?\b',
-                    col_def,
-                    re.IGNORECASE,
-                )
+                ref_match = _REFERENCES_RE.search(col_def)
                 if ref_match:
                     foreign_key = (ref_match.group(1), ref_match.group(2))
                     action = ref_match.group(3)
@@ -293,11 +353,7 @@ class SQLParser:
             # Parse VIRTUAL generated column
             generated_expr = None
             generated_virtual = False
-            gen_match = re.search(
-                r'(?:GENERATED\s+ALWAYS\s+)?AS\s*\((.+?)\)\s+VIRTUAL\b',
-                col_def,
-                re.IGNORECASE | re.DOTALL,
-            )
+            gen_match = _GENERATED_RE.search(col_def)
             if gen_match:
                 generated_expr = gen_match.group(1).strip()
                 generated_virtual = True
@@ -316,38 +372,52 @@ class SQLParser:
             )
             columns.append(column)
         
+        # Attach table-level foreign keys to their columns
+        columns_by_name = {col.name: col for col in columns}
+        for col_name, ref_table, ref_column, action in table_foreign_keys:
+            column = columns_by_name.get(col_name)
+            if column is None:
+                raise ValueError(f"FOREIGN KEY references unknown column: {col_name}")
+            column.foreign_key = (ref_table, ref_column)
+            if action:
+                column.foreign_key_on_delete = ' '.join(action.upper().split())
+        
         return columns
     
     def _parse_insert(self, sql: str) -> Dict[str, Any]:
         """Parse INSERT statement"""
         # Pattern: INSERT INTO table_name (columns) VALUES (values)
         # Also support: INSERT INTO table_name VALUES (values)
+        # Multi-row: INSERT INTO table_name VALUES (values), (values), ...
         
-        match = re.match(
-            r'INSERT INTO\s+([A-Za-z_][A-Za-z0-9_]*(?:\.[A-Za-z_][A-Za-z0-9_]*)?)\s*(?:\((.*?)\))?\s*VALUES\s*\((.*?)\)',
-            sql,
-            re.IGNORECASE | re.DOTALL
-        )
+        match = _INSERT_RE.match(sql)
         if not match:
             raise ValueError("Invalid INSERT syntax")
         
         table_name = match.group(1)
         columns_str = match.group(2)
-        values_str = match.group(3)
+        groups_str = match.group(3)
         
         # Parse columns if specified
         columns = None
         if columns_str:
             columns = [col.strip() for col in self._split_by_comma(columns_str)]
         
-        # Parse values
-        values = self._parse_values(values_str)
+        # Parse each parenthesized value group (quote-aware, so commas and
+        # parentheses inside string literals are preserved)
+        rows = []
+        for group in self._split_by_comma(groups_str):
+            group = group.strip()
+            if not (group.startswith('(') and group.endswith(')')):
+                raise ValueError("Invalid INSERT syntax")
+            rows.append(self._parse_values(group[1:-1]))
         
         return {
             'type': StatementType.INSERT,
             'table': table_name,
             'columns': columns,
-            'values': values
+            'values': rows[0],
+            'rows': rows
         }
     
     def _parse_select(self, sql: str) -> Dict[str, Any]:
@@ -389,7 +459,7 @@ class SQLParser:
             for col_expr in self._split_by_comma(select_clause):
                 col_expr = col_expr.strip()
                 # Check if it's an aggregate function
-                agg_match = re.match(r'(COUNT|SUM|AVG|MAX|MIN)\s*\(\s*(.+?)\s*\)', col_expr, re.IGNORECASE)
+                agg_match = _AGGREGATE_RE.match(col_expr)
                 if agg_match:
                     func_name = agg_match.group(1).upper()
                     arg = agg_match.group(2).strip()
@@ -465,20 +535,20 @@ class SQLParser:
 
         # No JOIN present: simple table reference
         if 'JOIN' not in upper:
-            main_match = re.match(r'^([A-Za-z_][A-Za-z0-9_]*(?:\.[A-Za-z_][A-Za-z0-9_]*)?)', clause)
+            main_match = _TABLE_NAME_RE.match(clause)
             if not main_match:
                 raise ValueError(f"Invalid FROM clause: {from_clause}")
             result['table'] = main_match.group(1)
             return result
 
         # Find the first JOIN (INNER/LEFT/JOIN) keyword start
-        join_kw_match = re.search(r'\b(?:INNER\s+JOIN|LEFT\s+JOIN|JOIN)\b', clause, flags=re.IGNORECASE)
+        join_kw_match = _JOIN_KEYWORD_RE.search(clause)
         if not join_kw_match:
             raise ValueError(f"Invalid JOIN syntax in FROM clause: {from_clause}")
 
         # Text before the first JOIN keyword is the main table
         main_part = clause[:join_kw_match.start()].strip()
-        main_match = re.match(r'^([A-Za-z_][A-Za-z0-9_]*(?:\.[A-Za-z_][A-Za-z0-9_]*)?)', main_part)
+        main_match = _TABLE_NAME_RE.match(main_part)
         if not main_match:
             raise ValueError(f"Invalid main table in FROM clause: {from_clause}")
         result['table'] = main_match.group(1)
@@ -487,11 +557,7 @@ class SQLParser:
         remaining = clause[join_kw_match.start():]
 
         # Iterate over JOIN clauses and extract join type, table, and condition
-        join_iter = re.finditer(
-            r'\b((?:INNER\s+JOIN|LEFT\s+JOIN|JOIN))\b\s+([A-Za-z_][A-Za-z0-9_]*(?:\.[A-Za-z_][A-Za-z0-9_]*)?)\s+ON\s+(.+?)(?=(?:\s+(?:INNER\s+JOIN|LEFT\s+JOIN|JOIN)\b)|$)',
-            remaining,
-            flags=re.IGNORECASE | re.DOTALL
-        )
+        join_iter = _JOIN_CLAUSE_RE.finditer(remaining)
 
         for m in join_iter:
             join_type_token = m.group(1).upper()
@@ -511,7 +577,7 @@ class SQLParser:
     def _parse_join_condition(self, condition: str) -> Dict[str, Any]:
         """Parse JOIN ON condition (e.g., table1.col = table2.col)"""
         # Simple equality condition
-        match = re.match(r'([\w.]+)\s*=\s*([\w.]+)', condition)
+        match = _JOIN_CONDITION_RE.match(condition)
         if match:
             return {
                 'left': match.group(1),
@@ -529,7 +595,7 @@ class SQLParser:
         conditions = []
         
         # Split by AND/OR
-        parts = re.split(r'\s+(AND|OR)\s+', where_clause, flags=re.IGNORECASE)
+        parts = _LOGICAL_SPLIT_RE.split(where_clause)
         
         logical_ops = []
         for i, part in enumerate(parts):
@@ -549,11 +615,9 @@ class SQLParser:
     def _parse_condition(self, condition: str) -> Dict[str, Any]:
         """Parse a single condition"""
         # Support: =, !=, <, >, <=, >=, LIKE
-        operators = ['<=', '>=', '!=', '=', '<', '>', 'LIKE']
-        
-        for op in operators:
+        for op in _CONDITION_OPERATORS:
             if op in condition.upper():
-                parts = re.split(f'\\s*{re.escape(op)}\\s*', condition, maxsplit=1, flags=re.IGNORECASE)
+                parts = _CONDITION_SPLIT_RES[op].split(condition, maxsplit=1)
                 if len(parts) == 2:
                     column = parts[0].strip()
                     value = parts[1].strip()
@@ -576,11 +640,7 @@ class SQLParser:
         """Parse UPDATE statement"""
         # Pattern: UPDATE table_name SET col1=val1, col2=val2 WHERE condition
         
-        match = re.match(
-            r'UPDATE\s+([A-Za-z_][A-Za-z0-9_]*(?:\.[A-Za-z_][A-Za-z0-9_]*)?)\s+SET\s+(.+?)(?:\s+WHERE\s+(.+))?$',
-            sql,
-            re.IGNORECASE | re.DOTALL
-        )
+        match = _UPDATE_RE.match(sql)
         if not match:
             raise ValueError("Invalid UPDATE syntax")
         
@@ -591,7 +651,7 @@ class SQLParser:
         # Parse SET clause
         updates = {}
         for assignment in self._split_by_comma(set_clause):
-            match = re.match(r'(\w+)\s*=\s*(.+)', assignment.strip())
+            match = _ASSIGNMENT_RE.match(assignment.strip())
             if match:
                 column = match.group(1)
                 value = match.group(2).strip()
@@ -620,11 +680,7 @@ class SQLParser:
         """Parse DELETE statement"""
         # Pattern: DELETE FROM table_name WHERE condition
         
-        match = re.match(
-            r'DELETE FROM\s+([A-Za-z_][A-Za-z0-9_]*(?:\.[A-Za-z_][A-Za-z0-9_]*)?)(?:\s+WHERE\s+(.+))?$',
-            sql,
-            re.IGNORECASE | re.DOTALL
-        )
+        match = _DELETE_RE.match(sql)
         if not match:
             raise ValueError("Invalid DELETE syntax")
         
@@ -646,11 +702,7 @@ class SQLParser:
         """Parse CREATE INDEX statement"""
         # Pattern: CREATE INDEX index_name ON table_name (column)
         
-        match = re.match(
-            r'CREATE INDEX\s+(\w+)\s+ON\s+([A-Za-z_][A-Za-z0-9_]*(?:\.[A-Za-z_][A-Za-z0-9_]*)?)\s*\((.*?)\)\s*$',
-            sql,
-            re.IGNORECASE
-        )
+        match = _CREATE_INDEX_RE.match(sql)
         if not match:
             raise ValueError("Invalid CREATE INDEX syntax")
 
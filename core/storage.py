@@ -39,12 +39,21 @@ Limitations & TODO:
 """
 import json
 import os
+import re
+from contextlib import contextmanager
+from functools import lru_cache
 from typing import Dict, List, Any, Optional
 from pathlib import Path
 from core.schema import Table
 from core.index import IndexManager
 
 
+@lru_cache(maxsize=128)
+def _like_regex(pattern: str):
+    """Compile a LIKE pattern (% as wildcard) once per distinct pattern"""
+    return re.compile(f"^{pattern.replace('%', '.*')}$", re.IGNORECASE)
+
+
 class Storage:
     """
     Storage engine for managing table data and indexes.
@@ -61,6 +70,8 @@ class Storage:
             - tables: Dict[table_name -> Table schema]
             - data: Dict[table_name -> List of rows]
             - indexes: Dict[table_name -> IndexManager]
+            - unique_maps: Dict[table_name -> {column -> {value -> row ID}}]
+            - foreign_key_refs: Dict[table_name -> {FK column -> {value -> row count}}]
             - next_row_ids: Dict[table_name -> next ID]
         
         Disk Storage:
@@ -74,10 +85,14 @@ class Storage:
         tables: In-memory table schemas
         data: In-memory row data
         indexes: B-tree indexes for each table
+        unique_maps: Hash maps backing UNIQUE/PRIMARY KEY checks
+        foreign_key_refs: Reference counts of FK column values (for ON DELETE)
         next_row_ids: Row ID generators
+        schema_version: Counter bumped whenever tables or indexes change,
+            for callers that cache schema metadata
     """
     
-    def __init__(self, data_dir: str = "data"):
+    def __init__(self, data_dir: str = "data", in_memory: bool = False):
         """
         Initialize the storage engine.
         
@@ -86,21 +101,32 @@ class Storage:
         
         Args:
             data_dir: Directory for storing database files
+            in_memory: Keep everything in RAM only; nothing is read from or
+                written to data_dir (useful for tests and scratch databases)
             
         Raises:
             OSError: If data directory cannot be created
         """
         self.data_dir = Path(data_dir)
-        self.data_dir.mkdir(parents=True, exist_ok=True)
+        self.in_memory = in_memory
+        if not in_memory:
+            self.data_dir.mkdir(parents=True, exist_ok=True)
         
         # In-memory state mirrors disk storage
         self.tables: Dict[str, Table] = {}                    # Table schemas
         self.data: Dict[str, List[Dict[str, Any]]] = {}      # Row data
         self.indexes: Dict[str, IndexManager] = {}            # Index managers
+        self.unique_maps: Dict[str, Dict[str, Dict[Any, int]]] = {}  # UNIQUE/PK value -> row ID
+        self.foreign_key_refs: Dict[str, Dict[str, Dict[Any, int]]] = {}  # FK value -> row count
         self.next_row_ids: Dict[str, int] = {}                # Row ID generators
+        self._txn_depth = 0                                   # Nesting level of transaction()
+        self._dirty_tables: set = set()                       # Data writes deferred by transaction()
+        self._txn_snapshot: Optional[Dict[str, Any]] = None   # In-memory rollback state
+        self.schema_version = 0                               # Bumped on CREATE TABLE/INDEX
         
         # Load existing tables from disk
-        self._load_all_tables()
+        if not in_memory:
+            self._load_all_tables()
     
     def create_table(self, table: Table):
         """
@@ -127,8 +153,10 @@ class Storage:
         
         # Register table schema
         self.tables[table.name] = table
+        self.schema_version += 1
         self.data[table.name] = []
         self.indexes[table.name] = IndexManager()
+        self._rebuild_key_maps(table.name)
         self.next_row_ids[table.name] = 0
         
         # Create automatic indexes on constraints
@@ -174,66 +202,170 @@ class Storage:
             Row must contain all NOT NULL columns.
             Missing nullable columns are stored as None.
         """
+        return self.insert_rows(table_name, [row])[0]
+    
+    def insert_rows(self, table_name: str, rows: List[Dict[str, Any]]) -> List[int]:
+        """
+        Insert several rows into a table with a single disk write.
+        
+        Each row goes through the same validation, constraint and index
+        steps as insert_row(); the table file is written once at the end.
+        The batch is all-or-nothing: if any row fails, every row appended
+        by this call is removed again before the error propagates.
+        
+        Args:
+            table_name: Name of target table
+            rows: Dictionaries with column_name -> value mappings
+            
+        Returns:
+            Internal row IDs assigned to the rows, in input order
+            
+        Raises:
+            ValueError: If table doesn't exist or constraints violated
+        """
         if table_name not in self.tables:
             raise ValueError(f"Table '{table_name}' does not exist")
         
         table = self.tables[table_name]
-
-        # Generated columns are computed; they cannot be inserted directly.
-        for col in table.columns:
-            if col.generated_expr and col.name in row:
-                raise ValueError(f"Cannot insert into generated column '{col.name}'")
-        
-        # Validate row against schema (type conversion, NOT NULL checks)
-        validated_row = table.validate_row(row)
+        table_rows = self.data[table_name]
+        index_mgr = self.indexes[table_name]
         
-        # Check uniqueness constraints (UNIQUE and PRIMARY KEY)
-        self._check_unique_constraints(table_name, validated_row)
+        start_count = len(table_rows)
+        start_row_id = self.next_row_ids[table_name]
+        row_ids: List[int] = []
         
-        # Check foreign key constraints
-        self._check_foreign_keys(table, validated_row)
+        try:
+            for row in rows:
+                # Generated columns are computed; they cannot be inserted directly.
+                for col in table.columns:
+                    if col.generated_expr and col.name in row:
+                        raise ValueError(f"Cannot insert into generated column '{col.name}'")
+                
+                # Validate row against schema (type conversion, NOT NULL checks)
+                validated_row = table.validate_row(row)
+                
+                # Check uniqueness constraints (UNIQUE and PRIMARY KEY).
+                # Rows appended earlier in this batch are already visible here.
+                self._check_unique_constraints(table_name, validated_row)
+                
+                # Check foreign key constraints
+                self._check_foreign_keys(table, validated_row)
+                
+                # Assign unique internal row ID
+                row_id = self.next_row_ids[table_name]
+                self.next_row_ids[table_name] += 1
+                validated_row['_row_id'] = row_id
+                
+                # Add to in-memory data structure
+                table_rows.append(validated_row)
+                row_ids.append(row_id)
+                
+                # Update indexes with new row
+                index_mgr.insert(validated_row, row_id)
+                self._add_key_entries(table_name, validated_row)
+            
+            # Persist to disk once for the whole batch
+            if row_ids:
+                self._save_table_data(table_name)
+        except Exception:
+            # Rollback: remove index entries and rows appended by this call,
+            # then rewind the row id generator.
+            for appended in table_rows[start_count:]:
+                try:
+                    index_mgr.delete(appended, appended['_row_id'])
+                except Exception:
+                    pass
+                self._remove_key_entries(table_name, appended)
+            del table_rows[start_count:]
+            self.next_row_ids[table_name] = start_row_id
+            raise
         
-        # Assign unique internal row ID
-        row_id = self.next_row_ids[table_name]
-        self.next_row_ids[table_name] += 1
-        validated_row['_row_id'] = row_id
+        # Update row count metadata
+        table.row_count += len(row_ids)
         
-        # Add to in-memory data structure
-        self.data[table_name].append(validated_row)
-
-        try:
-            # Update indexes with new row
-            self.indexes[table_name].insert(validated_row, row_id)
-
-            # Persist to disk
-            self._save_table_data(table_name)
+        return row_ids
+    
+    @contextmanager
+    def transaction(self):
+        """
+        Group data changes so each touched table is written to disk once.
 
-            # Update row count metadata
-            table.row_count += 1
-        except Exception:
-            # Best-effort rollback: remove row and index entries.
-            try:
-                self.indexes[table_name].delete(validated_row, row_id)
-            except Exception:
-                pass
+        While the block runs, table data files are not rewritten; tables are
+        only marked dirty. On normal exit every dirty table is saved a single
+        time. If the block raises, nothing is flushed and the in-memory state
+        is reloaded from disk, discarding the block's row changes.
 
-            try:
-                # Remove the inserted row if it still exists.
-                self.data[table_name] = [r for r in self.data[table_name] if r.get('_row_id') != row_id]
-            except Exception:
-                pass
+        Nested transaction() blocks join the outermost one. In-memory
+        storage has no disk copy to reload, so it copies every table's rows
+        when the outermost block starts and restores them on failure.
 
-            # Rewind row id generator if this was the last assigned id.
+        Note:
+            Schema changes (CREATE TABLE / CREATE INDEX) are written
+            immediately and are not rolled back. Each table file is replaced
+            atomically, but a crash during the final flush can leave some
+            tables saved and others not (there is no WAL).
+
+        Example:
+            >>> with storage.transaction():
+            ...     storage.insert_row('users', {...})
+            ...     storage.update_rows('accounts', {...}, cond)
+        """
+        if self._txn_depth:
+            self._txn_depth += 1
             try:
-                if self.next_row_ids.get(table_name) == row_id + 1:
-                    self.next_row_ids[table_name] = row_id
-            except Exception:
-                pass
+                yield
+            finally:
+                self._txn_depth -= 1
+            return
 
+        self._txn_depth = 1
+        self._dirty_tables = set()
+        if self.in_memory:
+            # No disk copy to fall back on: remember the rows instead
+            self._txn_snapshot = {
+                'data': {name: [row.copy() for row in rows] for name, rows in self.data.items()},
+                'next_row_ids': dict(self.next_row_ids),
+            }
+        try:
+            yield
+        except BaseException:
+            self._txn_depth = 0
+            self._dirty_tables = set()
+            if self.in_memory:
+                self._restore_snapshot()
+            else:
+                self._reload_from_disk()
             raise
-        
-        return row_id
-    
+        finally:
+            self._txn_snapshot = None
+
+        self._txn_depth = 0
+        dirty, self._dirty_tables = self._dirty_tables, set()
+        for table_name in sorted(dirty):
+            if table_name in self.tables:
+                self._save_table_data(table_name)
+
+    def _restore_snapshot(self):
+        """Put in-memory tables back to the state saved when transaction() began"""
+        snapshot = self._txn_snapshot
+        for table_name in self.tables:
+            # Tables created inside the block keep their schema but no rows
+            self.data[table_name] = snapshot['data'].get(table_name, [])
+            self.next_row_ids[table_name] = snapshot['next_row_ids'].get(table_name, 0)
+            self.indexes[table_name].rebuild(self.data[table_name])
+            self._rebuild_key_maps(table_name)
+
+    def _reload_from_disk(self):
+        """Discard in-memory state and reload every table from disk"""
+        self.tables = {}
+        self.data = {}
+        self.indexes = {}
+        self.unique_maps = {}
+        self.foreign_key_refs = {}
+        self.next_row_ids = {}
+        self.schema_version += 1
+        self._load_all_tables()
+
     def select_rows(self, table_name: str, condition: Optional[Dict] = None) -> List[Dict[str, Any]]:
         """Select rows from a table"""
         if table_name not in self.tables:
@@ -245,7 +377,7 @@ class Storage:
             return [self._remove_internal_fields(row) for row in rows]
         
         # Try to use index if available (single-column or composite) for equality predicates
-        eq_map = self._extract_equality_conditions(condition)
+        eq_map = self._extract_equality_conditions(condition, table_name)
         if eq_map:
             # Convert values to proper types
             converted = {}
@@ -271,8 +403,13 @@ class Storage:
                     key = converted[best_def.columns[0]]
                 else:
                     key = tuple(converted[c] for c in best_def.columns)
-                row_ids = best_def.index.search(key)
-                matching_rows = [row for row in rows if row['_row_id'] in set(row_ids)]
+                row_ids = set(best_def.index.search(key))
+                # The index narrows the candidates; the full condition still
+                # applies (other AND terms, case-sensitive string equality)
+                matching_rows = [
+                    row for row in rows
+                    if row['_row_id'] in row_ids and self._matches_condition(row, condition, table_name)
+                ]
                 return [self._remove_internal_fields(row) for row in matching_rows]
         
         # Full table scan
@@ -303,28 +440,36 @@ class Storage:
         for row in rows_to_update:
             old_row = row.copy()
             
-            # Apply updates with validation
-            for col_name, value in updates.items():
-                col_def = table.get_column(col_name)
-                if col_def:
-                    row[col_name] = col_def.convert(value)
-
-            # Recompute generated columns (if any) based on updated values
             try:
-                validated = table.validate_row(row)
-                for k, v in validated.items():
-                    row[k] = v
-            except (ValueError, TypeError) as e:
-                raise ValueError(str(e))
-            
-            # Check unique constraints
-            self._check_unique_constraints(table_name, row, exclude_row_id=row['_row_id'])
-            
-            # Check foreign key constraints
-            self._check_foreign_keys(table, row)
+                # Apply updates with validation
+                for col_name, value in updates.items():
+                    col_def = table.get_column(col_name)
+                    if col_def:
+                        row[col_name] = col_def.convert(value)
+
+                # Recompute generated columns (if any) based on updated values
+                try:
+                    validated = table.validate_row(row)
+                    for k, v in validated.items():
+                        row[k] = v
+                except (ValueError, TypeError) as e:
+                    raise ValueError(str(e))
+                
+                # Check unique constraints
+                self._check_unique_constraints(table_name, row, exclude_row_id=row['_row_id'])
+                
+                # Check foreign key constraints
+                self._check_foreign_keys(table, row)
+            except Exception:
+                # Leave the failing row as it was
+                row.clear()
+                row.update(old_row)
+                raise
             
             # Update indexes
             self.indexes[table_name].update(old_row, row, row['_row_id'])
+            self._remove_key_entries(table_name, old_row)
+            self._add_key_entries(table_name, row)
             
             updated_count += 1
         
@@ -356,19 +501,40 @@ class Storage:
         if table.primary_key:
             self._apply_on_delete_actions(table_name, rows_to_delete, table.primary_key)
         
-        # Delete rows
-        for row in rows_to_delete:
+        if not rows_to_delete:
+            return 0
+        
+        if len(rows_to_delete) == len(rows):
+            # Everything goes: empty the list and start with fresh indexes
+            rows.clear()
+            self.indexes[table_name].rebuild(rows)
+            self._rebuild_key_maps(table_name)
+        else:
             # Update indexes
-            self.indexes[table_name].delete(row, row['_row_id'])
+            for row in rows_to_delete:
+                self.indexes[table_name].delete(row, row['_row_id'])
+                self._remove_key_entries(table_name, row)
             
-            # Remove from data
-            self.data[table_name].remove(row)
+            # Remove from data in one pass (list.remove per row is quadratic)
+            deleted_ids = {row['_row_id'] for row in rows_to_delete}
+            rows[:] = [row for row in rows if row['_row_id'] not in deleted_ids]
         
-        if rows_to_delete:
-            self._save_table_data(table_name)
+        self._save_table_data(table_name)
         
         return len(rows_to_delete)
     
+    def truncate(self, table_name: str) -> int:
+        """
+        Remove every row from a table, keeping its schema and indexes.
+        
+        Foreign key ON DELETE actions still apply, so truncating a table
+        whose rows are referenced with RESTRICT raises ValueError.
+        
+        Returns:
+            Number of rows removed
+        """
+        return self.delete_rows(table_name)
+    
     def create_index(self, table_name: str, columns, index_name: Optional[str] = None):
         """Create an index on one or more columns."""
         if table_name not in self.tables:
@@ -403,14 +569,17 @@ class Storage:
                 continue
             key = key_parts[0] if len(key_parts) == 1 else tuple(key_parts)
             index.insert(key, row['_row_id'])
+        self.schema_version += 1
 
         # Persist updated schema (includes indexes metadata)
         self._save_table_schema(self.tables[table_name])
 
-    def _unqualify_column(self, name: str) -> str:
-        return name.split('.')[-1]
+    def _unqualify_column(self, name: str, table_name: str) -> str:
+        # Only this table's own qualifier is dropped: "b.name" is not a column of a
+        qualifier, _, column = name.rpartition('.')
+        return column if qualifier == table_name else name
 
-    def _extract_equality_conditions(self, condition: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    def _extract_equality_conditions(self, condition: Optional[Dict[str, Any]], table_name: str) -> Optional[Dict[str, Any]]:
         """Extract simple equality predicates from a WHERE condition tree.
 
         Supports:
@@ -421,7 +590,7 @@ class Storage:
             return None
 
         if 'column' in condition and condition.get('operator') == '=':
-            return {self._unqualify_column(condition['column']): condition.get('value')}
+            return {self._unqualify_column(condition['column'], table_name): condition.get('value')}
 
         if 'conditions' in condition:
             ops = condition.get('operators') or []
@@ -429,7 +598,7 @@ class Storage:
                 return None
             merged: Dict[str, Any] = {}
             for child in condition.get('conditions') or []:
-                m = self._extract_equality_conditions(child)
+                m = self._extract_equality_conditions(child, table_name)
                 if not m:
                     return None
                 merged.update(m)
@@ -438,22 +607,53 @@ class Storage:
         return None
     
     def _check_unique_constraints(self, table_name: str, row: Dict[str, Any], exclude_row_id: Optional[int] = None):
-        """Check unique constraints for a row"""
-        table = self.tables[table_name]
-        existing_rows = self.data[table_name]
-        
-        for col_name in table.unique_columns:
-            if col_name not in row or row[col_name] is None:
+        """Check unique constraints for a row (one hash lookup per unique column)"""
+        for col_name, owners in self.unique_maps[table_name].items():
+            value = row.get(col_name)
+            if value is None:
                 continue
             
-            value = row[col_name]
-            
-            for existing_row in existing_rows:
-                if exclude_row_id is not None and existing_row['_row_id'] == exclude_row_id:
-                    continue
-                
-                if existing_row.get(col_name) == value:
-                    raise ValueError(f"Unique constraint violation on column {col_name}")
+            owner = owners.get(value)
+            if owner is not None and owner != exclude_row_id:
+                raise ValueError(f"Unique constraint violation on column {col_name}")
+    
+    def _add_key_entries(self, table_name: str, row: Dict[str, Any]):
+        """Record a stored row's UNIQUE/PK values and FK references"""
+        row_id = row['_row_id']
+        for col_name, owners in self.unique_maps[table_name].items():
+            value = row.get(col_name)
+            if value is not None:
+                owners[value] = row_id
+        for col_name, counts in self.foreign_key_refs[table_name].items():
+            value = row.get(col_name)
+            if value is not None:
+                counts[value] = counts.get(value, 0) + 1
+    
+    def _remove_key_entries(self, table_name: str, row: Dict[str, Any]):
+        """Forget a row's UNIQUE/PK values (only entries that point at it) and FK references"""
+        row_id = row['_row_id']
+        for col_name, owners in self.unique_maps[table_name].items():
+            value = row.get(col_name)
+            if value is not None and owners.get(value) == row_id:
+                del owners[value]
+        for col_name, counts in self.foreign_key_refs[table_name].items():
+            value = row.get(col_name)
+            if value is None or value not in counts:
+                continue
+            if counts[value] > 1:
+                counts[value] -= 1
+            else:
+                del counts[value]
+    
+    def _rebuild_key_maps(self, table_name: str):
+        """Rebuild a table's UNIQUE/PK hash maps and FK reference counts from its rows"""
+        table = self.tables[table_name]
+        self.unique_maps[table_name] = {col_name: {} for col_name in table.unique_columns}
+        self.foreign_key_refs[table_name] = {
+            column.name: {} for column in table.columns if column.foreign_key
+        }
+        for row in self.data[table_name]:
+            self._add_key_entries(table_name, row)
     
     def _check_foreign_keys(self, table: Table, row: Dict[str, Any]):
         """
@@ -484,9 +684,14 @@ class Storage:
                 if ref_table not in self.tables:
                     raise ValueError(f"Referenced table {ref_table} does not exist")
                 
-                # Check if value exists in referenced table
-                ref_rows = self.data[ref_table]
-                value_exists = any(ref_row.get(ref_column) == value for ref_row in ref_rows)
+                # Check if value exists in referenced table: a hash lookup when
+                # the referenced column is PK/UNIQUE, otherwise a scan
+                owners = self.unique_maps[ref_table].get(ref_column)
+                if owners is not None:
+                    value_exists = value in owners
+                else:
+                    ref_rows = self.data[ref_table]
+                    value_exists = any(ref_row.get(ref_column) == value for ref_row in ref_rows)
                 
                 if not value_exists:
                     raise ValueError(
@@ -521,9 +726,9 @@ class Storage:
                 if ref_table != table_name or ref_column != pk_column:
                     continue
 
-                # Identify referencing rows
-                other_rows = self.data[other_table_name]
-                has_refs = any(other_row.get(column.name) in pk_values for other_row in other_rows)
+                # Identify referencing rows from the FK reference counts
+                refs = self.foreign_key_refs[other_table_name][column.name]
+                has_refs = any(value in refs for value in pk_values)
                 if not has_refs:
                     continue
 
@@ -575,8 +780,8 @@ class Storage:
             
             return result
         
-        # Single condition
-        column = condition['column']
+        # Single condition (users.id names this table's id column)
+        column = self._unqualify_column(condition['column'], table_name)
         operator = condition['operator']
         value = condition['value']
         
@@ -611,9 +816,7 @@ class Storage:
             return row_value >= value
         elif operator == 'LIKE':
             # Simple LIKE implementation (% as wildcard)
-            import re
-            pattern = value.replace('%', '.*')
-            return re.match(f'^{pattern}$', str(row_value), re.IGNORECASE) is not None
+            return _like_regex(value).match(str(row_value)) is not None
         
         return False
     
@@ -623,6 +826,8 @@ class Storage:
     
     def _save_table_schema(self, table: Table):
         """Save table schema to disk"""
+        if self.in_memory:
+            return
         schema_file = self.data_dir / f"{table.name}.schema.json"
         with open(schema_file, 'w') as f:
             data = table.to_dict()
@@ -636,6 +841,13 @@ class Storage:
     
     def _save_table_data(self, table_name: str):
         """Save table data to disk with atomic write"""
+        if self.in_memory:
+            return
+        if self._txn_depth:
+            # Inside transaction(): write once when the outermost block exits
+            self._dirty_tables.add(table_name)
+            return
+        
         data_file = self.data_dir / f"{table_name}.data.json"
         temp_file = self.data_dir / f"{table_name}.data.json.tmp"
         
@@ -711,6 +923,7 @@ class Storage:
                 index_mgr.insert(row, row['_row_id'])
             
             self.indexes[table_name] = index_mgr
+            self._rebuild_key_maps(table_name)
     
     def list_tables(self) -> List[str]:
         """List all tables"""
@@ -734,12 +947,14 @@ class Storage:
         """Get metadata about all indexes (virtual sys_indexes)"""
         result = []
         for table_name, index_mgr in self.indexes.items():
-            for col_name, btree in index_mgr.indexes.items():
+            table = self.tables[table_name]
+            for definition in index_mgr.list_indexes():
+                col_name = ', '.join(definition.columns)
                 result.append({
                     'table_name': table_name,
                     'column_name': col_name,
                     'index_type': 'B-Tree',
-                    'is_unique': col_name in self.tables[table_name].unique_columns or col_name == self.tables[table_name].primary_key
+                    'is_unique': col_name in table.unique_columns or col_name == table.primary_key
                 })
         return result
 
@@ -8,14 +8,17 @@ Demo script showcasing all SimpleSQLDB features including:
 
 from core.engine import QueryEngine
 from core.storage import Storage
+import os
 import shutil
+import sys
+import threading
+from operator import itemgetter
 from pathlib import Path
 
 def print_section(title):
     """Print a section header"""
-    print("\n" + "=" * 80)
-    print(f"  {title}")
-    print("=" * 80 + "\n")
+    rule = "=" * 80
+    sys.stdout.write(f"\n{rule}\n  {title}\n{rule}\n\n")
 
 def print_result(result):
     """Pretty print query result"""
@@ -25,24 +28,31 @@ def print_result(result):
             if rows:
                 # Print table
                 columns = list(rows[0].keys())
-                
-                # Calculate column widths
-                widths = {col: len(col) for col in columns}
-                for row in rows:
-                    for col in columns:
-                        widths[col] = max(widths[col], len(str(row.get(col, ''))))
-                
-                # Print header
-                header = ' | '.join(col.ljust(widths[col]) for col in columns)
-                print(header)
-                print('-' * len(header))
-                
-                # Print rows
+
+                # Extract each row's cells with one C-level itemgetter call; rows
+                # missing a column (e.g. unmatched LEFT JOIN sides) fall back to ''.
+                get = itemgetter(*columns)
+                single = len(columns) == 1
+                str_rows = []
                 for row in rows:
-                    row_str = ' | '.join(str(row.get(col, '')).ljust(widths[col]) for col in columns)
-                    print(row_str)
-                
-                print(f"\n{result['count']} row(s) returned")
+                    try:
+                        values = (get(row),) if single else get(row)
+                    except KeyError:
+                        values = [row.get(col, '') for col in columns]
+                    # Stringify every cell once, then size columns from the cached strings
+                    str_rows.append(list(map(str, values)))
+                widths = [
+                    max(len(col), max((len(sr[i]) for sr in str_rows), default=0))
+                    for i, col in enumerate(columns)
+                ]
+
+                # Buffer header and rows, then emit them with a single write
+                header = ' | '.join([col.ljust(widths[i]) for i, col in enumerate(columns)])
+                lines = [header, '-' * len(header)]
+                for sr in str_rows:
+                    lines.append(' | '.join([cell.ljust(widths[i]) for i, cell in enumerate(sr)]))
+                lines.append(f"\n{result['count']} row(s) returned")
+                sys.stdout.write('\n'.join(lines) + '\n')
             else:
                 print("(empty result set)")
         else:
@@ -50,13 +60,32 @@ def print_result(result):
     else:
         print(f"ERROR: {result['error']}")
 
+def reset_demo_dir(demo_dir):
+    """Move an old demo database out of the way and delete it in the background.
+
+    The rename is a single metadata operation, so the demo can start right away
+    while a daemon thread removes the stale copy. Leftovers from runs that exited
+    before their cleanup finished are swept up the same way.
+    """
+    stale_dirs = list(demo_dir.parent.glob(f"{demo_dir.name}.stale.*"))
+    if demo_dir.exists():
+        stale = demo_dir.with_name(f"{demo_dir.name}.stale.{os.getpid()}")
+        try:
+            demo_dir.rename(stale)
+            stale_dirs.append(stale)
+        except OSError:
+            # Rename can fail (e.g. files locked on Windows); delete in place
+            shutil.rmtree(demo_dir)
+
+    for stale in stale_dirs:
+        threading.Thread(target=shutil.rmtree, args=(stale, True), daemon=True).start()
+
 def main():
     """Run the comprehensive demo"""
     
     # Clean up and create fresh database
     demo_dir = Path('demo_db')
-    if demo_dir.exists():
-        shutil.rmtree(demo_dir)
+    reset_demo_dir(demo_dir)
     
     storage = Storage(str(demo_dir))
     engine = QueryEngine(storage)
@@ -99,8 +128,8 @@ def main():
         (4, 'HR', 150000.0)
     ]
     
-    for dept_id, name, budget in departments:
-        engine.execute(f"INSERT INTO departments VALUES ({dept_id}, '{name}', {budget});")
+    values = ", ".join(f"({dept_id}, '{name}', {budget})" for dept_id, name, budget in departments)
+    engine.execute(f"INSERT INTO departments VALUES {values};")
     print(f"Inserted {len(departments)} departments")
     
     # Insert employees
@@ -116,8 +145,11 @@ def main():
         (9, 'Ivy Chen', 4, 60000.0, '2020-09-20')
     ]
     
-    for emp_id, name, dept_id, salary, hire_date in employees:
-        engine.execute(f"INSERT INTO employees VALUES ({emp_id}, '{name}', {dept_id}, {salary}, '{hire_date}');")
+    values = ", ".join(
+        f"({emp_id}, '{name}', {dept_id}, {salary}, '{hire_date}')"
+        for emp_id, name, dept_id, salary, hire_date in employees
+    )
+    engine.execute(f"INSERT INTO employees VALUES {values};")
     print(f"Inserted {len(employees)} employees")
     
     # ========== AGGREGATE FUNCTIONS ==========
@@ -16,7 +16,8 @@ import os
 
 # Add project root to path
 PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
-sys.path.insert(0, PROJECT_ROOT)
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
 
 
 def show_menu():
@@ -120,9 +121,18 @@ def show_documentation():
 def run_tests():
     """Run pytest"""
     print("\n🧪 Running Tests...")
-    import subprocess
-    result = subprocess.run([sys.executable, "-m", "pytest", "tests/", "-v"], cwd=PROJECT_ROOT)
-    sys.exit(result.returncode)
+    args = [sys.executable, "-m", "pytest", "tests/", "-v"]
+
+    if os.name == "nt":
+        # Windows has no true exec (os.execv spawns and mis-quotes paths with spaces)
+        import subprocess
+        result = subprocess.run(args, cwd=PROJECT_ROOT)
+        sys.exit(result.returncode)
+
+    # Replace this process with pytest; its exit code becomes ours
+    sys.stdout.flush()
+    os.chdir(PROJECT_ROOT)
+    os.execv(sys.executable, args)
 
 
 def main():
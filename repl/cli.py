@@ -49,30 +49,78 @@ This module provides a command-line interface for interactive SQL:
 """
 import sys
 import os
+import shutil
+from collections import OrderedDict
+from itertools import islice
+from operator import itemgetter
 from typing import Optional
-from core.engine import QueryEngine
-from core.storage import Storage
-from core.database_manager import DatabaseManager
+
+
+# Result rows rendered per stdout write
+PRINT_CHUNK_ROWS = 1024
+
+# Explain plans kept by the REPL
+PLAN_CACHE_SIZE = 128
+
+# Explain-plan tree drawing pieces
+_PLAN_BRANCH = "├─ "
+_PLAN_LAST_BRANCH = "└─ "
+_PLAN_CONT = "│  "
+_PLAN_LAST = "   "
+
+
+def _clip(text: str, width: int) -> str:
+    """Shorten text to width characters, marking the cut with an ellipsis"""
+    if len(text) <= width:
+        return text
+    return text[:width - 1] + '…'
+
+
+def _stdout_writer():
+    """Return a write(text) callable for bulk output.
+    
+    Encodes each block once and hands the bytes to the binary buffer under
+    sys.stdout, skipping the text layer's per-write bookkeeping. Streams
+    without a buffer (e.g. io.StringIO in tests) get their own write().
+    """
+    stream = sys.stdout
+    out = getattr(stream, 'buffer', None)
+    if out is None:
+        return stream.write
+    # Anything already printed through the text layer must go out first
+    stream.flush()
+    encoding = stream.encoding or 'utf-8'
+    
+    def write(text: str):
+        out.write(text.encode(encoding, 'replace'))
+    
+    return write
 
 
 class REPL:
     """Interactive SQL REPL"""
     
     def __init__(self, data_dir: str = "databases"):
+        # Engine modules load here rather than at import time so that
+        # `--help` and other early exits never pay for them
+        from core.engine import QueryEngine
+        from core.storage import Storage
+        from core.database_manager import DatabaseManager
+
         # If a directory looks like a single database (contains *.schema.json),
         # keep legacy behavior. Otherwise treat it as a multi-db base directory.
         use_legacy = False
         try:
             path = os.path.abspath(data_dir)
             if os.path.isdir(path):
-                schema_files = [f for f in os.listdir(path) if f.endswith('.schema.json')]
-                use_legacy = len(schema_files) > 0
+                # Stop at the first schema file instead of listing the directory
+                with os.scandir(path) as entries:
+                    use_legacy = any(entry.name.endswith('.schema.json') for entry in entries)
         except Exception:
             use_legacy = False
 
         if use_legacy:
-            self.storage = Storage(data_dir)
-            self.engine = QueryEngine(self.storage)
+            self.engine = QueryEngine(Storage(data_dir))
         else:
             manager = DatabaseManager(base_dir=data_dir)
             # Back-compat: expose any existing single-db folders.
@@ -81,9 +129,30 @@ class REPL:
                 manager.register_database('studio', 'studio_data')
             # Ensure a default database exists for the REPL.
             manager.create_database('default')
-            self.storage = manager.open_storage('default')
-            self.engine = QueryEngine(self.storage, database_manager=manager, default_database='default')
+            self.engine = QueryEngine(manager.open_storage('default'), database_manager=manager, default_database='default')
         self.running = False
+        # Explain plans by normalized SQL, most recently used last
+        self._plan_cache = OrderedDict()
+        
+        # Special command dispatch table: command word -> handler(arg)
+        self._commands = {
+            '.exit': self._cmd_exit,
+            '.quit': self._cmd_exit,
+            '.tables': self._cmd_tables,
+            '.schema': self._cmd_schema,
+            '.explain': self._cmd_explain,
+            '.sys_tables': self._cmd_sys_tables,
+            '.sys_indexes': self._cmd_sys_indexes,
+        }
+    
+    @property
+    def storage(self) -> 'Storage':
+        """Storage of the current database.
+        
+        Metadata commands read the engine's live in-memory schema directly
+        (a dict lookup), so they follow USE and see DDL without any cache.
+        """
+        return self.engine.storage
     
     def start(self):
         """Start the REPL"""
@@ -105,109 +174,148 @@ class REPL:
         print("=" * 60)
         print()
         
+        # Piped scripts (python -m repl.cli < script.sql) skip the prompt loop
+        if not sys.stdin.isatty():
+            self._run_script(sys.stdin)
+            return
+        
         buffer = []
+        # Per-line callables bound once; only .exit/.quit stop the loop, so
+        # self.running is checked after special commands rather than per line
+        read_line = input
+        handle_special = self._handle_special_command
+        execute = self._execute_statement
         
-        while self.running:
+        # The prompt only changes when a statement starts or finishes
+        prompt = "sql> "
+        
+        while True:
             try:
-                if buffer:
-                    prompt = "... "
-                else:
-                    prompt = "sql> "
-                
-                line = input(prompt)
+                line = read_line(prompt)
                 
                 # Handle special commands
                 if line.startswith('.'):
-                    self._handle_special_command(line)
+                    handle_special(line)
+                    if not self.running:
+                        break
                     continue
                 
                 # Add line to buffer
                 buffer.append(line)
                 
-                # Check if statement is complete
-                full_statement = ' '.join(buffer)
-                if full_statement.strip().endswith(';'):
+                # Statement is complete when the newest line ends with ';' (only
+                # that line is checked; the buffer is joined once, on completion)
+                if line.rstrip().endswith(';'):
                     # Execute statement
-                    self._execute_statement(full_statement)
+                    execute(' '.join(buffer))
                     buffer = []
+                    prompt = "sql> "
+                else:
+                    prompt = "... "
             
             except KeyboardInterrupt:
                 print("\nUse .exit or .quit to exit")
                 buffer = []
+                prompt = "sql> "
             except EOFError:
                 print("\nGoodbye!")
                 break
     
+    def _run_script(self, stream):
+        """Execute statements read line by line from a non-interactive stream"""
+        buffer = []
+        handle_special = self._handle_special_command
+        execute = self._execute_statement
+        for line in stream:
+            line = line.rstrip('\n')
+            
+            if line.startswith('.'):
+                handle_special(line)
+                if not self.running:
+                    return
+                continue
+            
+            buffer.append(line)
+            if line.rstrip().endswith(';'):
+                execute(' '.join(buffer))
+                buffer = []
+        
+        print("\nGoodbye!")
+    
     def _handle_special_command(self, command: str):
         """Handle special REPL commands"""
-        parts = command.strip().split()
+        # Split once into the command word and its argument text
+        parts = command.strip().split(None, 1)
         cmd = parts[0].lower()
+        arg = parts[1] if len(parts) > 1 else ''
         
-        if cmd in ['.exit', '.quit']:
-            print("Goodbye!")
-            self.running = False
-        
-        elif cmd == '.tables':
-            tables = self.storage.list_tables()
-            if tables:
-                print("\nTables:")
-                for table in tables:
-                    print(f"  - {table}")
-            else:
-                print("\nNo tables found")
-            print()
-        
-        elif cmd == '.schema':
-            if len(parts) < 2:
-                print("Usage: .schema <table_name>")
-                return
-            
-            table_name = parts[1]
-            table = self.storage.get_table(table_name)
-            
-            if table:
-                print(f"\n{table}")
-                print()
-            else:
-                print(f"\nTable {table_name} does not exist\n")
-        
-        elif cmd == '.explain':
-            # Extract SQL from command (everything after .explain)
-            sql = command[8:].strip()
-            if not sql:
-                print("Usage: .explain <SQL query>")
-                return
-            self._explain_query(sql)
+        handler = self._commands.get(cmd)
+        if handler is None:
+            print(f"Unknown command: {cmd}")
+            return
+        handler(arg)
+    
+    def _cmd_exit(self, arg: str):
+        print("Goodbye!")
+        self.running = False
+    
+    def _cmd_tables(self, arg: str):
+        tables = self.storage.list_tables()
+        if tables:
+            print("\nTables:")
+            for table in tables:
+                print(f"  - {table}")
+        else:
+            print("\nNo tables found")
+        print()
+    
+    def _cmd_schema(self, arg: str):
+        if not arg:
+            print("Usage: .schema <table_name>")
+            return
         
-        elif cmd == '.sys_tables':
-            tables_info = self.storage.get_system_tables_info()
-            if tables_info:
-                print("\nSystem Tables Metadata:")
-                print("-" * 80)
-                for info in tables_info:
-                    print(f"Table: {info['table_name']}")
-                    print(f"  Columns: {info['column_count']}")
-                    print(f"  Rows: {info['row_count']}")
-                    print(f"  Primary Key: {info['primary_key'] or 'None'}")
-                    print(f"  Created: {info['created_at']}")
-                    print()
-            else:
-                print("\nNo tables found\n")
+        table_name = arg.split()[0]
+        table = self.storage.get_table(table_name)
         
-        elif cmd == '.sys_indexes':
-            indexes_info = self.storage.get_system_indexes_info()
-            if indexes_info:
-                print("\nSystem Indexes Metadata:")
-                print("-" * 80)
-                for info in indexes_info:
-                    unique_str = " (UNIQUE)" if info['is_unique'] else ""
-                    print(f"{info['table_name']}.{info['column_name']}: {info['index_type']}{unique_str}")
+        if table:
+            print(f"\n{table}")
+            print()
+        else:
+            print(f"\nTable {table_name} does not exist\n")
+    
+    def _cmd_explain(self, arg: str):
+        # Everything after .explain is the SQL to explain
+        if not arg:
+            print("Usage: .explain <SQL query>")
+            return
+        self._explain_query(arg)
+    
+    def _cmd_sys_tables(self, arg: str):
+        tables_info = self.storage.get_system_tables_info()
+        if tables_info:
+            print("\nSystem Tables Metadata:")
+            print("-" * 80)
+            for info in tables_info:
+                print(f"Table: {info['table_name']}")
+                print(f"  Columns: {info['column_count']}")
+                print(f"  Rows: {info['row_count']}")
+                print(f"  Primary Key: {info['primary_key'] or 'None'}")
+                print(f"  Created: {info['created_at']}")
                 print()
-            else:
-                print("\nNo indexes found\n")
-        
         else:
-            print(f"Unknown command: {cmd}")
+            print("\nNo tables found\n")
+    
+    def _cmd_sys_indexes(self, arg: str):
+        indexes_info = self.storage.get_system_indexes_info()
+        if indexes_info:
+            print("\nSystem Indexes Metadata:")
+            print("-" * 80)
+            for info in indexes_info:
+                unique_str = " (UNIQUE)" if info['is_unique'] else ""
+                print(f"{info['table_name']}.{info['column_name']}: {info['index_type']}{unique_str}")
+            print()
+        else:
+            print("\nNo indexes found\n")
     
     def _execute_statement(self, sql: str):
         """Execute a SQL statement"""
@@ -225,66 +333,130 @@ class REPL:
                 self._print_result_table(result['rows'])
                 print(f"\n{result['count']} row(s) returned")
             else:
-                # Other queries
+                # Other queries; DDL and USE can change plans, so drop them
+                self._plan_cache.clear()
                 print(result['message'])
         else:
             print(f"Error: {result['error']}")
         
         print()
     
-    def _print_result_table(self, rows: list):
-        """Print query results in a table format"""
-        if not rows:
+    def _print_result_table(self, rows):
+        """Print query results in a table format
+
+        Rows may be any iterable; they are stringified and written
+        PRINT_CHUNK_ROWS at a time, so only one block is held as text.
+        Column widths come from the first block: a longer value further
+        down widens its own line rather than the whole column.
+        """
+        rows = iter(rows)
+        first = list(islice(rows, PRINT_CHUNK_ROWS))
+        if not first:
             print("(empty result set)")
             return
         
         # Get all column names
-        columns = list(rows[0].keys())
+        columns = list(first[0].keys())
         
-        # Calculate column widths
-        widths = {col: len(col) for col in columns}
-        for row in rows:
-            for col in columns:
-                value_str = str(row.get(col, ''))
-                widths[col] = max(widths[col], len(value_str))
+        # Engine rows share the first row's keys, so pull cells with a single
+        # itemgetter call and only fall back to .get() for ragged rows.
+        get = itemgetter(*columns)
+        single = len(columns) == 1
         
-        # Print header
-        header = ' | '.join(col.ljust(widths[col]) for col in columns)
-        print(header)
-        print('-' * len(header))
+        def stringify(block):
+            cells = []
+            append = cells.append
+            for row in block:
+                try:
+                    values = (get(row),) if single else get(row)
+                except KeyError:
+                    values = [row.get(col, '') for col in columns]
+                append(list(map(str, values)))
+            return cells
         
-        # Print rows
-        for row in rows:
-            row_str = ' | '.join(str(row.get(col, '')).ljust(widths[col]) for col in columns)
-            print(row_str)
+        # Stringify each cell once; widths and rendering reuse the strings.
+        # Transpose once so each width is a C-level max(map(len, ...))
+        cells = stringify(first)
+        widths = [
+            max(len(col), max(map(len, values)))
+            for col, values in zip(columns, zip(*cells))
+        ]
+        labels = columns
+        
+        # On a terminal, cap each column at an even share of the screen width
+        # so long values are cut short instead of wrapping every line.
+        # Redirected output is left untouched.
+        clip = False
+        if sys.stdout.isatty():
+            term_cols = shutil.get_terminal_size((120, 20)).columns
+            budget = max(8, term_cols // len(columns) - 3)
+            if max(widths) > budget:
+                widths = [min(w, budget) for w in widths]
+                labels = [_clip(col, widths[i]) for i, col in enumerate(columns)]
+                clip = True
+        
+        # One write per block keeps the output buffer small and shows the
+        # first rows before the later ones are even read
+        write = _stdout_writer()
+        header = ' | '.join([col.ljust(widths[i]) for i, col in enumerate(labels)])
+        write(header + '\n' + '-' * len(header) + '\n')
+        while cells:
+            if clip:
+                cells = [[_clip(cell, widths[i]) for i, cell in enumerate(r)] for r in cells]
+            lines = [
+                ' | '.join([cell.ljust(widths[i]) for i, cell in enumerate(r)])
+                for r in cells
+            ]
+            write('\n'.join(lines) + '\n')
+            cells = stringify(islice(rows, PRINT_CHUNK_ROWS))
+        sys.stdout.flush()
 
     def _explain_query(self, sql: str):
         """Explain a query by printing the engine's structured plan."""
+        # Reuse the plan of an identical statement. Keyed on the exact text:
+        # collapsing inner whitespace would also merge different string literals
+        key = sql.strip()
+        cache = self._plan_cache
         try:
-            plan = self.engine.explain(sql)
+            plan = cache.get(key)
+            if plan is None:
+                plan = self.engine.explain(sql)
+                cache[key] = plan
+                if len(cache) > PLAN_CACHE_SIZE:
+                    cache.popitem(last=False)
+            else:
+                cache.move_to_end(key)
             print()
             self._print_plan_tree(plan)
             print()
         except Exception as e:
             print(f"Error generating explain plan: {e}")
 
-    def _print_plan_tree(self, node: dict, prefix: str = "", is_last: bool = True):
+    def _print_plan_tree(self, node: dict):
         """Pretty-print a plan tree returned by QueryEngine.explain()."""
+        lines = []
+        self._collect_plan_lines(node, "", True, lines)
+        if lines:
+            sys.stdout.write('\n'.join(lines) + '\n')
+
+    def _collect_plan_lines(self, node: dict, prefix: str, is_last: bool, lines: list):
+        """Append one rendered line per plan node to lines, depth first."""
         if not node:
             return
 
-        connector = "└─ " if is_last else "├─ "
+        connector = _PLAN_LAST_BRANCH if is_last else _PLAN_BRANCH
         node_type = node.get('type', 'UNKNOWN')
         details = node.get('details')
         label = node_type
         if details:
             label = f"{node_type} {details}"
-        print(prefix + connector + label)
+        lines.append(prefix + connector + label)
 
         children = node.get('children') or []
-        next_prefix = prefix + ("   " if is_last else "│  ")
+        next_prefix = prefix + (_PLAN_LAST if is_last else _PLAN_CONT)
+        last = len(children) - 1
         for i, child in enumerate(children):
-            self._print_plan_tree(child, next_prefix, i == len(children) - 1)
+            self._collect_plan_lines(child, next_prefix, i == last, lines)
 
 
 
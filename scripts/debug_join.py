@@ -9,9 +9,11 @@ engine = QueryEngine(storage)
 engine.execute("CREATE TABLE students (id INT PRIMARY KEY, name VARCHAR(50))")
 engine.execute("CREATE TABLE courses (id INT PRIMARY KEY, name VARCHAR(50))")
 engine.execute("CREATE TABLE enrollments (id INT PRIMARY KEY, student_id INT, course_id INT)")
-engine.execute("INSERT INTO students VALUES (1, 'Alice')")
-engine.execute("INSERT INTO courses VALUES (1, 'Math')")
-engine.execute("INSERT INTO enrollments VALUES (1, 1, 1)")
+# Seed rows through the engine's bulk path (no SQL parsing per row)
+with engine.transaction():
+    engine.copy_from('students', None, [(1, 'Alice')])
+    engine.copy_from('courses', None, [(1, 'Math')])
+    engine.copy_from('enrollments', None, [(1, 1, 1)])
 
 sql = """
 SELECT students.name, courses.name
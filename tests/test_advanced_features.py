@@ -19,7 +19,7 @@ from core.storage import Storage
 @pytest.fixture
 def test_storage(tmp_path):
     """Create a temporary storage for testing"""
-    storage = Storage(str(tmp_path))
+    storage = Storage(str(tmp_path), in_memory=True)
     yield storage
     # Cleanup
     if Path(tmp_path).exists():
@@ -106,13 +106,15 @@ def test_group_by_single_column(test_engine):
     assert result['success']
     assert len(result['rows']) == 2
     
+    by_category = {r['category']: r for r in result['rows']}
+    
     # Find Electronics group
-    electronics = [r for r in result['rows'] if r['category'] == 'Electronics'][0]
+    electronics = by_category['Electronics']
     assert electronics['count'] == 2
     assert electronics['total'] == 300.0
     
     # Find Books group
-    books = [r for r in result['rows'] if r['category'] == 'Books'][0]
+    books = by_category['Books']
     assert books['count'] == 2
     assert books['total'] == 75.0
 
@@ -159,6 +161,33 @@ def test_having_clause(test_engine):
     assert 'Bob' not in customers
 
 
+def test_having_group_column_pushdown(test_engine):
+    """Test HAVING terms on GROUP BY columns are applied before aggregation"""
+    test_engine.execute("CREATE TABLE orders (id INT PRIMARY KEY, customer VARCHAR(50), total FLOAT);")
+    test_engine.execute("INSERT INTO orders VALUES (1, 'Alice', 100.0), (2, 'Alice', 150.0), (3, 'Bob', 50.0), (4, 'Charlie', 300.0);")
+    
+    query = "SELECT customer, SUM(total) AS sum_total FROM orders "
+    
+    # A group-column term in HAVING gives the same groups as filtering in WHERE
+    result = test_engine.execute(query + "GROUP BY customer HAVING customer = 'Alice' AND SUM(total) > 200;")
+    assert result['success']
+    assert result['rows'] == [{'customer': 'Alice', 'sum_total': 250.0}]
+    expected = test_engine.execute(query + "WHERE customer = 'Alice' GROUP BY customer HAVING SUM(total) > 200;")
+    assert result['rows'] == expected['rows']
+    
+    # Combined with an existing WHERE
+    result = test_engine.execute(query + "WHERE total > 120 GROUP BY customer HAVING customer = 'Alice';")
+    assert result['rows'] == [{'customer': 'Alice', 'sum_total': 150.0}]
+    
+    # OR chains can't be pushed: Charlie matches only the aggregate term
+    result = test_engine.execute(query + "GROUP BY customer HAVING customer = 'Alice' OR SUM(total) > 200;")
+    assert {r['customer'] for r in result['rows']} == {'Alice', 'Charlie'}
+    
+    # Equality on an aggregate, not a group column, stays in HAVING
+    result = test_engine.execute(query + "GROUP BY customer HAVING SUM(total) = 50;")
+    assert result['rows'] == [{'customer': 'Bob', 'sum_total': 50.0}]
+
+
 def test_foreign_key_insert_valid(test_engine):
     """Test foreign key constraint with valid insert"""
     # Create parent table
@@ -193,6 +222,29 @@ def test_foreign_key_insert_invalid(test_engine):
     assert 'foreign key' in result['error'].lower()
 
 
+def test_foreign_key_table_constraint(test_engine):
+    """Test table-level FOREIGN KEY (col) REFERENCES table(col) syntax"""
+    test_engine.execute("CREATE TABLE departments (id INT PRIMARY KEY, name VARCHAR(100));")
+    test_engine.execute("INSERT INTO departments VALUES (1, 'Engineering');")
+
+    result = test_engine.execute("""
+        CREATE TABLE employees (
+            id INT PRIMARY KEY,
+            name VARCHAR(100),
+            dept_id INT,
+            FOREIGN KEY (dept_id) REFERENCES departments(id)
+        );
+    """)
+    assert result['success']
+
+    result = test_engine.execute("INSERT INTO employees VALUES (1, 'Alice', 1);")
+    assert result['success']
+
+    result = test_engine.execute("INSERT INTO employees VALUES (2, 'Bob', 999);")
+    assert not result['success']
+    assert 'foreign key' in result['error'].lower()
+
+
 def test_foreign_key_delete_violation(test_engine):
     """Test referential integrity on delete"""
     # Create parent table
@@ -211,6 +263,30 @@ def test_foreign_key_delete_violation(test_engine):
     assert 'referenced' in result['error'].lower()
 
 
+def test_foreign_key_delete_violation_large(test_engine):
+    """Test referential integrity on delete with many referencing rows"""
+    test_engine.execute("CREATE TABLE departments (id INT PRIMARY KEY, name VARCHAR(100));")
+    test_engine.execute("INSERT INTO departments VALUES (1, 'Engineering'), (2, 'Sales'), (3, 'Legal');")
+    test_engine.execute("CREATE TABLE employees (id INT PRIMARY KEY, name VARCHAR(100), dept_id INT REFERENCES departments(id));")
+    values = ', '.join(f"({i}, 'Employee {i}', {1 + i % 2})" for i in range(10000))
+    result = test_engine.execute(f"INSERT INTO employees VALUES {values};")
+    assert result['success']
+    
+    # Departments 1 and 2 are referenced; 3 is not
+    result = test_engine.execute("DELETE FROM departments WHERE id = 2;")
+    assert not result['success']
+    assert 'referenced' in result['error'].lower()
+    assert test_engine.execute("DELETE FROM departments WHERE id = 3;")['success']
+    
+    # Once its employees are gone, a department can be deleted
+    test_engine.execute("DELETE FROM employees WHERE dept_id = 2;")
+    assert test_engine.execute("DELETE FROM departments WHERE id = 2;")['success']
+    
+    result = test_engine.execute("INSERT INTO employees VALUES (20000, 'Zed', 2);")
+    assert not result['success']
+    assert 'foreign key' in result['error'].lower()
+
+
 def test_foreign_key_update_valid(test_engine):
     """Test foreign key constraint with valid update"""
     # Create parent table
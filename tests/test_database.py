@@ -16,7 +16,20 @@ import shutil
 
 @pytest.fixture
 def engine():
-    """Create a test engine with temporary storage"""
+    """Create a test engine with in-memory storage"""
+    temp_dir = tempfile.mkdtemp()
+    storage = Storage(data_dir=temp_dir, in_memory=True)
+    engine = QueryEngine(storage)
+    
+    yield engine
+    
+    # Cleanup
+    shutil.rmtree(temp_dir)
+
+
+@pytest.fixture
+def disk_engine():
+    """Create a test engine with temporary on-disk storage"""
     temp_dir = tempfile.mkdtemp()
     storage = Storage(data_dir=temp_dir)
     engine = QueryEngine(storage)
@@ -69,6 +82,22 @@ def test_where_clause(engine):
     assert len(result['rows']) == 2
 
 
+def test_qualified_where_on_indexed_column(engine):
+    """Test table-qualified WHERE columns on the index and scan paths"""
+    engine.execute("CREATE TABLE users (id INT PRIMARY KEY, name VARCHAR(50))")
+    engine.execute("INSERT INTO users VALUES (1, 'Alice')")
+    engine.execute("INSERT INTO users VALUES (2, 'Bob')")
+    
+    result = engine.execute("SELECT * FROM users WHERE users.id = 2")
+    assert result['rows'] == [{'id': 2, 'name': 'Bob'}]
+    
+    result = engine.execute("SELECT * FROM users WHERE users.id = 1 AND users.name = 'Alice'")
+    assert len(result['rows']) == 1
+    
+    result = engine.execute("SELECT * FROM users WHERE users.name != 'Alice'")
+    assert [row['id'] for row in result['rows']] == [2]
+
+
 def test_update(engine):
     """Test UPDATE"""
     engine.execute("CREATE TABLE users (id INT PRIMARY KEY, name VARCHAR(50))")
@@ -120,6 +149,43 @@ def test_inner_join(engine):
     assert len(result['rows']) == 1
 
 
+def test_join_where_on_joined_table(engine):
+    """Test WHERE columns qualified with a joined table"""
+    engine.execute("CREATE TABLE a (id INT PRIMARY KEY, name VARCHAR(50))")
+    engine.execute("CREATE TABLE b (id INT PRIMARY KEY, a_id INT, name VARCHAR(50))")
+    engine.execute("INSERT INTO a VALUES (1, 'x')")
+    engine.execute("INSERT INTO a VALUES (2, 'y')")
+    engine.execute("INSERT INTO b VALUES (10, 1, 'y')")
+    engine.execute("INSERT INTO b VALUES (11, 2, 'x')")
+
+    join = "SELECT a.name, b.name FROM a INNER JOIN b ON a.id = b.a_id"
+    result = engine.execute(f"{join} WHERE b.name = 'y'")
+    assert result['rows'] == [{'a.name': 'x', 'b.name': 'y'}]
+
+    result = engine.execute(f"{join} WHERE a.name = 'y'")
+    assert result['rows'] == [{'a.name': 'y', 'b.name': 'x'}]
+
+    result = engine.execute(f"{join} WHERE a.id = 1 OR b.id = 11")
+    assert len(result['rows']) == 2
+
+
+def test_multi_row_insert(engine):
+    """Test INSERT with several VALUES groups"""
+    engine.execute("CREATE TABLE users (id INT PRIMARY KEY, name VARCHAR(50))")
+    
+    result = engine.execute("INSERT INTO users (id, name) VALUES (1, 'Alice'), (2, 'Bob, Jr.'), (3, 'Carol (QA)')")
+    assert result['success'] == True
+    assert result['rows_affected'] == 3
+    
+    result = engine.execute("SELECT * FROM users WHERE id = 2")
+    assert result['rows'][0]['name'] == 'Bob, Jr.'
+    
+    # A failing row rejects the whole statement
+    result = engine.execute("INSERT INTO users VALUES (4, 'Dave'), (1, 'Duplicate')")
+    assert result['success'] == False
+    assert len(engine.execute("SELECT * FROM users")['rows']) == 3
+
+
 def test_unique_constraint(engine):
     """Test UNIQUE constraint"""
     engine.execute("CREATE TABLE users (id INT PRIMARY KEY, email VARCHAR(100) UNIQUE)")
@@ -163,14 +229,14 @@ def test_limit(engine):
     assert len(result['rows']) == 2
 
 
-def test_persistence(engine):
+def test_persistence(disk_engine):
     """Test data persistence"""
     # Create and insert data
-    engine.execute("CREATE TABLE users (id INT PRIMARY KEY, name VARCHAR(50))")
-    engine.execute("INSERT INTO users VALUES (1, 'Alice')")
+    disk_engine.execute("CREATE TABLE users (id INT PRIMARY KEY, name VARCHAR(50))")
+    disk_engine.execute("INSERT INTO users VALUES (1, 'Alice')")
     
     # Create new engine with same storage
-    storage = Storage(data_dir=engine.storage.data_dir)
+    storage = Storage(data_dir=disk_engine.storage.data_dir)
     new_engine = QueryEngine(storage)
     
     # Verify data persisted
@@ -179,5 +245,214 @@ def test_persistence(engine):
     assert result['rows'][0]['name'] == 'Alice'
 
 
+def test_transaction(disk_engine):
+    """Test transaction defers writes and rolls back on error"""
+    disk_engine.execute("CREATE TABLE users (id INT PRIMARY KEY, name VARCHAR(50))")
+    
+    with disk_engine.transaction():
+        disk_engine.execute("INSERT INTO users VALUES (1, 'Alice')")
+        disk_engine.execute("INSERT INTO users VALUES (2, 'Bob')")
+        
+        # Not on disk yet, but visible in memory
+        on_disk = Storage(data_dir=disk_engine.storage.data_dir)
+        assert on_disk.select_rows('users') == []
+        assert len(disk_engine.execute("SELECT * FROM users")['rows']) == 2
+    
+    on_disk = Storage(data_dir=disk_engine.storage.data_dir)
+    assert len(on_disk.select_rows('users')) == 2
+    
+    # An exception discards every change made inside the block
+    with pytest.raises(RuntimeError):
+        with disk_engine.transaction():
+            disk_engine.execute("INSERT INTO users VALUES (3, 'Carol')")
+            disk_engine.execute("DELETE FROM users WHERE id = 1")
+            raise RuntimeError("abort")
+    
+    result = disk_engine.execute("SELECT * FROM users ORDER BY id ASC")
+    assert [row['id'] for row in result['rows']] == [1, 2]
+
+
+def test_prepared_statement(engine):
+    """Test prepared statements with ? placeholders"""
+    engine.execute("CREATE TABLE users (id INT PRIMARY KEY, name VARCHAR(50), age INT)")
+    
+    insert = engine.prepare("INSERT INTO users (id, name, age) VALUES (?, ?, ?)")
+    assert insert.param_count == 3
+    # Preparing the same text again reuses the parsed statement
+    assert engine.prepare("INSERT INTO users (id, name, age) VALUES (?, ?, ?)") is insert
+    result = insert.execute((1, "O'Brien", 30))
+    assert result['success'] == True
+    
+    result = insert.executemany([(2, 'Bob', 20), (3, 'Who?', 40)])
+    assert result['success'] == True
+    assert result['rows_affected'] == 2
+    
+    # A failing parameter set rejects the whole batch
+    result = insert.executemany([(4, 'Dave', 50), (1, 'Duplicate', 60)])
+    assert result['success'] == False
+    
+    select = engine.prepare("SELECT * FROM users WHERE id = ?")
+    result = select.execute((1,))
+    assert result['rows'][0]['name'] == "O'Brien"
+    
+    update = engine.prepare("UPDATE users SET age = ? WHERE id = ?")
+    result = update.executemany([(31, 1), (41, 3)])
+    assert result['rows_affected'] == 2
+    
+    result = engine.execute("SELECT * FROM users ORDER BY id ASC")
+    assert [row['age'] for row in result['rows']] == [31, 20, 41]
+    
+    # Quoted question marks are literals, not placeholders
+    assert engine.prepare("SELECT * FROM users WHERE name = 'Who?'").param_count == 0
+    
+    result = insert.execute((5,))
+    assert result['success'] == False
+
+
+def test_truncate(disk_engine):
+    """Test truncating a table keeps schema and indexes usable"""
+    disk_engine.execute("CREATE TABLE users (id INT PRIMARY KEY, email VARCHAR(100) UNIQUE)")
+    disk_engine.execute("INSERT INTO users VALUES (1, 'a@example.com'), (2, 'b@example.com'), (3, 'c@example.com')")
+    
+    result = disk_engine.execute("DELETE FROM users WHERE id = 2")
+    assert result['rows_affected'] == 1
+    assert disk_engine.storage.truncate('users') == 2
+    assert disk_engine.execute("SELECT * FROM users")['rows'] == []
+    
+    # Old keys are gone from the indexes
+    result = disk_engine.execute("INSERT INTO users VALUES (1, 'a@example.com')")
+    assert result['success'] == True
+    result = disk_engine.execute("SELECT * FROM users WHERE email = 'a@example.com'")
+    assert len(result['rows']) == 1
+    
+    storage = Storage(data_dir=disk_engine.storage.data_dir)
+    assert len(storage.select_rows('users')) == 1
+
+
+def test_copy_from(engine):
+    """Test loading row tuples without SQL parsing"""
+    engine.execute("CREATE TABLE users (id INT PRIMARY KEY, name VARCHAR(50), age INT)")
+    
+    result = engine.copy_from('users', ['id', 'name', 'age'], [(1, "O'Brien", 30), (2, 'Bob', '25')])
+    assert result['success'] == True
+    assert result['rows_affected'] == 2
+    
+    # Values are converted to the column types
+    result = engine.execute("SELECT * FROM users WHERE id = 2")
+    assert result['rows'][0]['age'] == 25
+    
+    # A bad row rejects the whole load
+    result = engine.copy_from('users', None, [(3, 'Carol', 40), (1, 'Duplicate', 50)])
+    assert result['success'] == False
+    assert len(engine.execute("SELECT * FROM users")['rows']) == 2
+    
+    result = engine.copy_from('missing', None, [(1,)])
+    assert result['success'] == False
+
+
+def test_insert_rows(engine):
+    """Test inserting value tuples directly, in table column order"""
+    engine.execute("CREATE TABLE users (id INT PRIMARY KEY, name VARCHAR(50))")
+    
+    assert engine.insert_row('users', (1, 'Alice'))['rows_affected'] == 1
+    result = engine.insert_rows('users', [(2, 'Bob'), (3, 'Carol')])
+    assert result['success'] == True
+    assert result['rows_affected'] == 2
+    
+    # A duplicate key rejects the whole batch
+    assert engine.insert_rows('users', [(4, 'Dave'), (1, 'Again')])['success'] == False
+    result = engine.execute("SELECT * FROM users WHERE id = 3")
+    assert result['rows'] == [{'id': 3, 'name': 'Carol'}]
+    assert len(engine.execute("SELECT * FROM users")['rows']) == 3
+
+
+def test_system_indexes_info(engine):
+    """Test sys_indexes metadata lists single-column and composite indexes"""
+    engine.execute("CREATE TABLE users (id INT PRIMARY KEY, email VARCHAR(100) UNIQUE, city VARCHAR(50), age INT)")
+    engine.execute("CREATE INDEX idx_city_age ON users (city, age)")
+    
+    info = {i['column_name']: i for i in engine.storage.get_system_indexes_info()}
+    assert set(info) == {'id', 'email', 'city, age'}
+    assert info['id']['is_unique'] and info['email']['is_unique']
+    assert not info['city, age']['is_unique']
+    
+    # Schema changes bump schema_version; row writes do not
+    version = engine.storage.schema_version
+    engine.execute("INSERT INTO users VALUES (1, 'a@example.com', 'Nairobi', 30)")
+    assert engine.storage.schema_version == version
+    engine.execute("CREATE INDEX idx_age ON users (age)")
+    assert engine.storage.schema_version > version
+
+
+def test_execute_many(engine):
+    """Test running a batch of statements as one all-or-nothing unit"""
+    result = engine.execute_many(
+        "CREATE TABLE users (id INT PRIMARY KEY, name VARCHAR(50)); "
+        "INSERT INTO users VALUES (1, 'semi;colon'); "
+        "INSERT INTO users VALUES (2, 'Bob');"
+    )
+    assert result['success'] == True
+    assert len(result['results']) == 3
+    assert result['rows_affected'] == 2
+    
+    result = engine.execute("SELECT * FROM users WHERE id = 1")
+    assert result['rows'][0]['name'] == 'semi;colon'
+    
+    # A failing statement discards the row changes of the whole batch
+    result = engine.execute_many([
+        "INSERT INTO users VALUES (3, 'Carol')",
+        "INSERT INTO users VALUES (1, 'Duplicate')",
+    ])
+    assert result['success'] == False
+    assert result['error'].startswith('Statement 2:')
+    assert len(engine.execute("SELECT * FROM users")['rows']) == 2
+    
+    # Parse errors are reported before anything runs
+    result = engine.execute_many(["INSERT INTO users VALUES (4, 'Dave')", "NOT SQL"])
+    assert result['success'] == False
+    assert len(engine.execute("SELECT * FROM users")['rows']) == 2
+
+
+def test_unique_checks_many_rows(engine):
+    """Test PRIMARY KEY/UNIQUE checks and index lookups stay correct at 10k rows"""
+    engine.execute("CREATE TABLE users (id INT PRIMARY KEY, email VARCHAR(100) UNIQUE, team INT)")
+    values = ', '.join(f"({i}, 'user{i}@example.com', {i % 10})" for i in range(10000))
+    result = engine.execute(f"INSERT INTO users VALUES {values}")
+    assert result['success'] == True
+    
+    assert engine.execute("INSERT INTO users VALUES (9999, 'new@example.com', 1)")['success'] == False
+    assert engine.execute("INSERT INTO users VALUES (10000, 'user5@example.com', 1)")['success'] == False
+    
+    # Index lookups find every match, including keys used as B-tree separators
+    assert all(len(engine.execute(f"SELECT * FROM users WHERE id = {i}")['rows']) == 1 for i in range(0, 10000, 97))
+    assert len(engine.execute("SELECT * FROM users WHERE team = 3")['rows']) == 1000
+    
+    # Freed values can be reused; updates move the unique entry with the row
+    assert engine.execute("DELETE FROM users WHERE id = 5")['success'] == True
+    assert engine.execute("UPDATE users SET email = 'user5@example.com' WHERE id = 6")['success'] == True
+    assert engine.execute("INSERT INTO users VALUES (10000, 'user6@example.com', 1)")['success'] == True
+
+
+def test_in_memory_storage(engine):
+    """Test in-memory storage writes nothing and rolls back from a snapshot"""
+    engine.execute("CREATE TABLE users (id INT PRIMARY KEY, name VARCHAR(50) UNIQUE)")
+    engine.execute("INSERT INTO users VALUES (1, 'Alice')")
+    assert os.listdir(engine.storage.data_dir) == []
+    
+    with pytest.raises(RuntimeError):
+        with engine.transaction():
+            engine.execute("INSERT INTO users VALUES (2, 'Bob')")
+            engine.execute("UPDATE users SET name = 'Alicia' WHERE id = 1")
+            raise RuntimeError("abort")
+    
+    result = engine.execute("SELECT * FROM users")
+    assert result['rows'] == [{'id': 1, 'name': 'Alice'}]
+    
+    # Key maps and indexes were rebuilt from the snapshot
+    assert engine.execute("INSERT INTO users VALUES (2, 'Bob')")['success'] == True
+    assert engine.execute("INSERT INTO users VALUES (3, 'Alicia')")['success'] == True
+    assert engine.execute("INSERT INTO users VALUES (4, 'Alice')")['success'] == False
+
+
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])
@@ -1,20 +1,31 @@
 
+import argparse
+import sys
 from html.parser import HTMLParser
+from pathlib import Path
 
-class MyHTMLParser(HTMLParser):
-    def handle_starttag(self, tag, attrs):
-        pass
-    def handle_endtag(self, tag):
-        pass
-    def handle_data(self, data):
-        pass
+DEFAULT_TEMPLATE = Path(__file__).resolve().parent / 'web_demo' / 'templates' / 'studio.html'
 
-try:
-    with open(r'C:\Users\E.Samwel\Desktop\RDMS\web_demo\templates\studio.html', 'r', encoding='utf-8') as f:
-        content = f.read()
-    
-    parser = MyHTMLParser()
-    parser.feed(content)
-    print("HTML Parsed successfully.")
-except Exception as e:
-    print(f"HTML Parsing Failed: {e}")
+
+def main():
+    parser = argparse.ArgumentParser(description='Check that HTML templates parse')
+    parser.add_argument('paths', nargs='*', default=[str(DEFAULT_TEMPLATE)],
+                        help='HTML files to parse (default: the studio template)')
+    args = parser.parse_args()
+
+    failed = False
+    for path in args.paths:
+        try:
+            # The base parser's handlers are already no-ops, so no subclass is needed
+            html = HTMLParser()
+            html.feed(Path(path).read_text(encoding='utf-8'))
+            html.close()
+            print(f"{path}: HTML Parsed successfully.")
+        except Exception as e:
+            print(f"{path}: HTML Parsing Failed: {e}")
+            failed = True
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
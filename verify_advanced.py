@@ -1,26 +1,35 @@
 
-import urllib.request
-import urllib.error
+import http.client
 import json
 import time
+from contextlib import closing
 
-BASE_URL = "http://localhost:5000/api"
+BASE_PATH = "/api"
+CSV_CHUNK_SIZE = 64 * 1024
+
+# One keep-alive connection for every call; http.client reconnects on its
+# own if the server closed it after the previous response
+conn = http.client.HTTPConnection("localhost", 5000)
 
 def request(method, endpoint, data=None):
-    url = f"{BASE_URL}{endpoint}"
-    req = urllib.request.Request(url, method=method)
-    req.add_header('Content-Type', 'application/json')
+    body = json.dumps(data).encode('utf-8') if data else None
     
-    if data:
-        json_data = json.dumps(data).encode('utf-8')
-        req.data = json_data
-        
     try:
-        with urllib.request.urlopen(req) as response:
-            return json.loads(response.read().decode('utf-8'))
-    except urllib.error.HTTPError as e:
-        print(f"HTTP Error {e.code}: {e.read().decode('utf-8')}")
+        conn.request(method, f"{BASE_PATH}{endpoint}", body=body,
+                     headers={'Content-Type': 'application/json'})
+        response = conn.getresponse()
+        # Read the whole body so the connection can be reused
+        content = response.read().decode('utf-8')
+    except Exception as e:
+        conn.close()
+        print(f"Error: {e}")
         return None
+    
+    if response.status >= 400:
+        print(f"HTTP Error {response.status}: {content}")
+        return None
+    try:
+        return json.loads(content)
     except Exception as e:
         print(f"Error: {e}")
         return None
@@ -61,27 +70,43 @@ def test_workflow():
          return False
     print("Row inserted.")
     
-    # 3. Export CSV
-    print("Exporting CSV...")
-    res = request('GET', f"/table/{table_name}/export")
-    if not res or not res.get('success'):
-        print(f"FAILED to export")
-        return False
-        
-    csv_content = res.get('csv')
-    print(f"CSV Content Length: {len(csv_content)}")
-    print(f"CSV Snippet: {csv_content[:100]}...")
-    
-    # 4. Import CSV
-    print("Importing CSV into new table...")
+    # 3. Create the import target first: the main connection is busy
+    # while the export is being streamed
     target_table = f"{table_name}_import"
     create_payload['name'] = target_table
     request('POST', "/tables/create", create_payload)
     
-    import_payload = {"csv": csv_content}
-    res = request('POST', f"/table/{target_table}/import", import_payload)
+    # 4. Export CSV and pipe it straight into the import, chunk by chunk
+    print("Exporting CSV into new table...")
+    conn.request('GET', f"{BASE_PATH}/table/{table_name}/export?format=csv")
+    export = conn.getresponse()
+    if export.status != 200:
+        print(f"FAILED to export: HTTP {export.status}: {export.read().decode('utf-8')}")
+        return False
+    
+    exported = {'bytes': 0, 'snippet': b''}
+    
+    def export_chunks():
+        while True:
+            chunk = export.read(CSV_CHUNK_SIZE)
+            if not chunk:
+                return
+            if len(exported['snippet']) < 100:
+                exported['snippet'] += chunk[:100 - len(exported['snippet'])]
+            exported['bytes'] += len(chunk)
+            yield chunk
+    
+    with closing(http.client.HTTPConnection("localhost", 5000)) as upload:
+        upload.request('POST', f"{BASE_PATH}/table/{target_table}/import", body=export_chunks(),
+                       headers={'Content-Type': 'text/csv'}, encode_chunked=True)
+        response = upload.getresponse()
+        content = response.read().decode('utf-8')
+    
+    print(f"CSV Content Length: {exported['bytes']}")
+    print(f"CSV Snippet: {exported['snippet'].decode('utf-8', 'replace')}...")
+    res = json.loads(content) if response.status < 400 else None
     if not res or not res.get('success'):
-        print(f"FAILED to import")
+        print(f"FAILED to import: HTTP {response.status}: {content}")
         return False
         
     print(f"Import result: {res.get('message')}")
@@ -96,7 +121,9 @@ def test_workflow():
         return False
 
 if __name__ == "__main__":
-    if test_workflow():
+    with closing(conn):
+        ok = test_workflow()
+    if ok:
         print("\nSUCCESS: All advanced features verified!")
     else:
         print("\nFAILURE: Verification failed.")
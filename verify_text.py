@@ -1,26 +1,34 @@
 
-import urllib.request
-import urllib.error
+import http.client
 import json
 import time
+from contextlib import closing
 
-BASE_URL = "http://localhost:5000/api"
+BASE_PATH = "/api"
+
+# One keep-alive connection for every call; http.client reconnects on its
+# own if the server closed it after the previous response
+conn = http.client.HTTPConnection("localhost", 5000)
 
 def request(method, endpoint, data=None):
-    url = f"{BASE_URL}{endpoint}"
-    req = urllib.request.Request(url, method=method)
-    req.add_header('Content-Type', 'application/json')
+    body = json.dumps(data).encode('utf-8') if data else None
     
-    if data:
-        json_data = json.dumps(data).encode('utf-8')
-        req.data = json_data
-        
     try:
-        with urllib.request.urlopen(req) as response:
-            return json.loads(response.read().decode('utf-8'))
-    except urllib.error.HTTPError as e:
-        print(f"HTTP Error {e.code}: {e.read().decode('utf-8')}")
+        conn.request(method, f"{BASE_PATH}{endpoint}", body=body,
+                     headers={'Content-Type': 'application/json'})
+        response = conn.getresponse()
+        # Read the whole body so the connection can be reused
+        content = response.read().decode('utf-8')
+    except Exception as e:
+        conn.close()
+        print(f"Error: {e}")
         return None
+    
+    if response.status >= 400:
+        print(f"HTTP Error {response.status}: {content}")
+        return None
+    try:
+        return json.loads(content)
     except Exception as e:
         print(f"Error: {e}")
         return None
@@ -58,7 +66,9 @@ def test_text():
     return True
 
 if __name__ == "__main__":
-    if test_text():
+    with closing(conn):
+        ok = test_text()
+    if ok:
         print("\nSUCCESS: TEXT feature verified!")
     else:
         print("\nFAILURE: TEXT verification failed.")
@@ -26,6 +26,17 @@ DEMO_USERS = {
     'registrar@school.edu': {'password': 'registrar123', 'role': 'Registrar', 'name': 'Jane Official', 'id': 99994}
 }
 
+# Profile details for the demo accounts' users rows: (phone, address, date_of_birth)
+DEMO_PROFILES = {
+    'admin@school.edu': ('+254700000001', 'Admin Block', '1980-01-01'),
+    'registrar@school.edu': ('+254700000004', 'Admin Block', '1982-01-01'),
+    'teacher@school.edu': ('+254700000002', 'Staff Quarters School', '1985-05-15'),
+    'student@school.edu': ('+254700000003', 'Dormitory A', '2005-08-20'),
+}
+
+# Grades drawn for generated gradebook enrollments
+DEMO_GRADES = ('A', 'B', 'C', 'D', 'F')
+
 # Initialize database ("database" == a folder, like MariaDB databases)
 DB_NAME = 'school_erp'
 DB_DIR = os.path.join('databases', DB_NAME)
@@ -77,13 +88,11 @@ def init_school_database():
                         created_at VARCHAR(50)
                     )
                 """)
-                db_exec("CREATE INDEX idx_auth_email ON auth_users (email)")
-                db_exec("CREATE INDEX idx_auth_role ON auth_users (role)")
             except Exception:
                 pass
 
+        _seed_and_index()
         system_initialized = True
-        ensure_demo_data()
         return
     
     print("🏫 Initializing School Management ERP Database...")
@@ -234,119 +243,103 @@ def init_school_database():
         )
     """)
     
-    # Create indexes for performance
-    db_exec("CREATE INDEX idx_users_role ON users (role)")
-    db_exec("CREATE INDEX idx_auth_email ON auth_users (email)")
-    db_exec("CREATE INDEX idx_auth_role ON auth_users (role)")
-    db_exec("CREATE INDEX idx_enrollments_student ON enrollments (student_id)")
-    db_exec("CREATE INDEX idx_enrollments_course ON enrollments (course_id)")
-    db_exec("CREATE INDEX idx_attendance_student ON attendance (student_id)")
-    db_exec("CREATE INDEX idx_financials_student ON financials (student_id)")
-    db_exec("CREATE INDEX idx_borrowings_student ON borrowings (student_id)")
-    
-    print("✅ School ERP Database initialized (tables + indexes ready)")
+    _seed_and_index()
     system_initialized = True
-    ensure_demo_data()
+    print("✅ School ERP Database initialized (tables + indexes ready)")
 
 
-def ensure_demo_data():
-    """Ensure demo users and relationships exist for a feasibility"""
-    print("🔧 Verifying Demo Data Integrity...")
-    
-    # 0. Ensure Admin and Registrar exist
-    admin = DEMO_USERS['admin@school.edu']
-    res = db_rows("SELECT id FROM users WHERE email = 'admin@school.edu'")
-    if not res:
-        print(f"Creating Demo Admin: {admin['name']}")
-        try:
-            db_exec(f"""
-                INSERT INTO users (id, name, email, role, phone, address, date_of_birth, enrollment_date)
-                VALUES ({admin['id']}, '{admin['name']}', 'admin@school.edu', 'Admin', 
-                        '+254700000001', 'Admin Block', '1980-01-01', '{datetime.now().strftime('%Y-%m-%d')}')
-            """)
-        except Exception:
-            pass
+def _seed_and_index():
+    """Load the demo data, then make sure every performance index exists
 
-    auth = db_rows(f"SELECT id FROM auth_users WHERE email = 'admin@school.edu'")
-    if not auth:
+    A failed seed is logged, not raised: the schema works without demo rows,
+    and raising would re-run (and re-fail) init on every request.
+    """
+    try:
+        # Seed inside one transaction: each table file is written once, and a
+        # failure leaves the on-disk database untouched.
+        with engine.transaction():
+            ensure_demo_data()
+    except Exception as e:
+        print(f"⚠️ Demo data seeding failed: {e}")
+
+    # Build indexes once over the seeded rows rather than maintaining them
+    # per insert; runs even if seeding failed
+    create_school_indexes()
+
+
+# Performance indexes: (index name, table, column)
+SCHOOL_INDEXES = (
+    ('idx_users_role', 'users', 'role'),
+    ('idx_auth_email', 'auth_users', 'email'),
+    ('idx_auth_role', 'auth_users', 'role'),
+    ('idx_enrollments_student', 'enrollments', 'student_id'),
+    ('idx_enrollments_course', 'enrollments', 'course_id'),
+    ('idx_attendance_student', 'attendance', 'student_id'),
+    ('idx_financials_student', 'financials', 'student_id'),
+    ('idx_borrowings_student', 'borrowings', 'student_id'),
+)
+
+
+def create_school_indexes():
+    """Create any missing performance indexes; safe to call on every start"""
+    for index_name, table_name, column in SCHOOL_INDEXES:
+        if storage.get_table(table_name) is None:
+            continue
+        # Already indexed (by an earlier run, or as a UNIQUE column)
+        if storage.indexes[table_name].has_index(column):
+            continue
         try:
-            db_exec(f"""
-                INSERT INTO auth_users (id, user_id, name, email, password, role, created_at)
-                VALUES ({admin['id']}, {admin['id']}, '{admin['name']}', 'admin@school.edu', '{admin['password']}', 'Admin', '{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}')
-            """)
-        except Exception:
-            pass
+            db_exec(f"CREATE INDEX {index_name} ON {table_name} ({column})")
+        except Exception as e:
+            print(f"⚠️ Index creation failed: {e}")
 
-    registrar = DEMO_USERS['registrar@school.edu']
-    res = db_rows("SELECT id FROM users WHERE email = 'registrar@school.edu'")
-    if not res:
-        print(f"Creating Demo Registrar: {registrar['name']}")
-        try:
-            db_exec(f"""
-                INSERT INTO users (id, name, email, role, phone, address, date_of_birth, enrollment_date)
-                VALUES ({registrar['id']}, '{registrar['name']}', 'registrar@school.edu', 'Registrar', 
-                        '+254700000004', 'Admin Block', '1982-01-01', '{datetime.now().strftime('%Y-%m-%d')}')
-            """)
-        except Exception:
-            pass
 
-    auth = db_rows(f"SELECT id FROM auth_users WHERE email = 'registrar@school.edu'")
-    if not auth:
-        try:
-            db_exec(f"""
-                INSERT INTO auth_users (id, user_id, name, email, password, role, created_at)
-                VALUES ({registrar['id']}, {registrar['id']}, '{registrar['name']}', 'registrar@school.edu', '{registrar['password']}', 'Registrar', '{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}')
-            """)
-        except Exception:
-            pass
+DEMO_USER_COLUMNS = ('id', 'name', 'email', 'role', 'phone', 'address', 'date_of_birth', 'enrollment_date')
+DEMO_LOGIN_COLUMNS = ('id', 'user_id', 'name', 'email', 'password', 'role', 'created_at')
 
-    # 1. Ensure Demo Teacher exists
-    teacher = DEMO_USERS['teacher@school.edu']
-    res = db_rows("SELECT id FROM users WHERE email = 'teacher@school.edu'")
-    if not res:
-        print(f"Creating Demo Teacher: {teacher['name']}")
-        try:
-            db_exec(f"""
-                INSERT INTO users (id, name, email, role, phone, address, date_of_birth, enrollment_date)
-                VALUES ({teacher['id']}, '{teacher['name']}', 'teacher@school.edu', 'Teacher', 
-                        '+254700000002', 'Staff Quarters School', '1985-05-15', '{datetime.now().strftime('%Y-%m-%d')}')
-            """)
-        except Exception:
-            pass
 
-    auth = db_rows(f"SELECT id FROM auth_users WHERE email = 'teacher@school.edu'")
-    if not auth:
-        try:
-            db_exec(f"""
-                INSERT INTO auth_users (id, user_id, name, email, password, role, created_at)
-                VALUES ({teacher['id']}, {teacher['id']}, '{teacher['name']}', 'teacher@school.edu', '{teacher['password']}', 'Teacher', '{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}')
-            """)
-        except Exception:
-            pass
+def _load_demo_rows(table_name, columns, rows):
+    """Insert demo rows in one bulk load, falling back to row by row.
 
-    # 2. Ensure Demo Student exists
-    student = DEMO_USERS['student@school.edu']
-    res = db_rows("SELECT id FROM users WHERE email = 'student@school.edu'")
-    if not res:
-        print(f"Creating Demo Student: {student['name']}")
-        try:
-            db_exec(f"""
-                INSERT INTO users (id, name, email, role, phone, address, date_of_birth, enrollment_date)
-                VALUES ({student['id']}, '{student['name']}', 'student@school.edu', 'Student', 
-                        '+254700000003', 'Dormitory A', '2005-08-20', '{datetime.now().strftime('%Y-%m-%d')}')
-            """)
-        except Exception:
-            pass
+    A row that already exists (e.g. a leftover from an older database) must
+    not keep the other demo rows out, so if the batch is rejected each row is
+    retried on its own and failures are skipped.
+    """
+    if not rows:
+        return
+    if engine.copy_from(table_name, columns, rows).get('success'):
+        return
+    for row in rows:
+        engine.copy_from(table_name, columns, [row])
 
-    auth = db_rows(f"SELECT id FROM auth_users WHERE email = 'student@school.edu'")
-    if not auth:
-        try:
-            db_exec(f"""
-                INSERT INTO auth_users (id, user_id, name, email, password, role, created_at)
-                VALUES ({student['id']}, {student['id']}, '{student['name']}', 'student@school.edu', '{student['password']}', 'Student', '{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}')
-            """)
-        except Exception:
-            pass
+
+def ensure_demo_data():
+    """Ensure demo users and relationships exist for a feasibility"""
+    print("🔧 Verifying Demo Data Integrity...")
+    
+    # Timestamps are formatted once for every demo account
+    now = datetime.now()
+    today = now.strftime('%Y-%m-%d')
+    created_at = now.strftime('%Y-%m-%d %H:%M:%S')
+    
+    # 0-2. Ensure every demo account has a users row and a matching auth_users login
+    new_users = []
+    new_logins = []
+    for email, (phone, address, date_of_birth) in DEMO_PROFILES.items():
+        account = DEMO_USERS[email]
+        role = account['role']
+        if not db_rows(f"SELECT id FROM users WHERE email = '{email}'"):
+            print(f"Creating Demo {role}: {account['name']}")
+            new_users.append((account['id'], account['name'], email, role, phone, address, date_of_birth, today))
+        # The login row is derived from the same account record
+        if not db_rows(f"SELECT id FROM auth_users WHERE email = '{email}'"):
+            new_logins.append((account['id'], account['id'], account['name'], email, account['password'], role, created_at))
+
+    _load_demo_rows('users', DEMO_USER_COLUMNS, new_users)
+    _load_demo_rows('auth_users', DEMO_LOGIN_COLUMNS, new_logins)
+
+    teacher = DEMO_USERS['teacher@school.edu']
+    student = DEMO_USERS['student@school.edu']
         
     # 3. Assign 3 random courses to Demo Teacher (if they have none)
     my_courses = db_rows(f"SELECT id FROM courses WHERE teacher_id = {teacher['id']}")
@@ -357,13 +350,24 @@ def ensure_demo_data():
         for c in courses:
             db_exec(f"UPDATE courses SET teacher_id = {teacher['id']} WHERE id = {c['id']}")
 
+    # Enrollment ids already in use; generated ids skip them, so a random
+    # collision can't make an insert (and with it the whole seed) fail
+    used_enrollment_ids = {e['id'] for e in db_rows("SELECT id FROM enrollments")}
+
+    def new_enrollment_id():
+        eid = random.randint(100000, 999999)
+        while eid in used_enrollment_ids:
+            eid = random.randint(100000, 999999)
+        used_enrollment_ids.add(eid)
+        return eid
+
     # 4. Enroll Demo Student in Demo Teacher's courses (if not enrolled)
     my_courses = db_rows(f"SELECT id FROM courses WHERE teacher_id = {teacher['id']}")
     for c in my_courses:
         enrollment = db_rows(f"SELECT id FROM enrollments WHERE student_id = {student['id']} AND course_id = {c['id']}")
         if not enrollment:
             print(f"Enrolling Demo Student in Course {c['id']}...")
-            eid = random.randint(100000, 999999)
+            eid = new_enrollment_id()
             db_exec(f"""
                 INSERT INTO enrollments (id, student_id, course_id, grade, enrollment_date, status, midterm_score, final_score)
                 VALUES ({eid}, {student['id']}, {c['id']}, 'B', '2024-01-15', 'Active', 75.5, 82.0)
@@ -374,6 +378,11 @@ def ensure_demo_data():
     all_students_res = db_rows("SELECT id FROM users WHERE role = 'Student' LIMIT 50")
     if all_students_res:
         all_students = [s['id'] for s in all_students_res]
+        # Bind the RNG methods once instead of looking them up per row
+        choice, uniform = random.choice, random.uniform
+        # One scan for existing (student, course) pairs instead of a query per student
+        enrolled = {(e['student_id'], e['course_id']) for e in db_rows("SELECT student_id, course_id FROM enrollments")}
+        new_enrollments = []
         for c in my_courses:
             # Check enrollment count
             count_res = db_rows(f"SELECT COUNT(*) as cnt FROM enrollments WHERE course_id = {c['id']}")
@@ -384,16 +393,21 @@ def ensure_demo_data():
                 target_students = random.sample(all_students, min(10, len(all_students)))
                 for sid in target_students:
                     # Check if already enrolled
-                    check = db_rows(f"SELECT id FROM enrollments WHERE student_id = {sid} AND course_id = {c['id']}")
-                    if not check:
-                        eid = random.randint(100000, 999999)
-                        grade = random.choice(['A', 'B', 'C', 'D', 'F'])
-                        mid = random.uniform(40, 99)
-                        fin = random.uniform(40, 99)
-                        db_exec(f"""
-                            INSERT INTO enrollments (id, student_id, course_id, grade, enrollment_date, status, midterm_score, final_score)
-                            VALUES ({eid}, {sid}, {c['id']}, '{grade}', '2024-01-15', 'Active', {mid:.1f}, {fin:.1f})
-                        """)
+                    if (sid, c['id']) not in enrolled:
+                        eid = new_enrollment_id()
+                        grade = choice(DEMO_GRADES)
+                        mid = uniform(40, 99)
+                        fin = uniform(40, 99)
+                        new_enrollments.append(
+                            f"({eid}, {sid}, {c['id']}, '{grade}', '2024-01-15', 'Active', {mid:.1f}, {fin:.1f})"
+                        )
+        
+        # Insert every generated enrollment with one multi-row statement
+        if new_enrollments:
+            db_exec(f"""
+                INSERT INTO enrollments (id, student_id, course_id, grade, enrollment_date, status, midterm_score, final_score)
+                VALUES {', '.join(new_enrollments)}
+            """)
 
 
 def log_action(user_role, action, sql_command, status="SUCCESS"):
@@ -1062,19 +1076,28 @@ def bulk_import_students():
     success_count = 0
     errors = []
     
-    for student in students:
-        try:
-            user_id = random.randint(1000, 99999)
-            sql = f"""
-                INSERT INTO users (id, name, email, role, phone, address, date_of_birth, enrollment_date)
-                VALUES ({user_id}, '{student['name']}', '{student['email']}', 'Student',
-                        '{student.get('phone', '')}', '{student.get('address', '')}',
-                        '{student.get('date_of_birth', '2005-01-01')}', '{datetime.now().strftime('%Y-%m-%d')}')
-            """
-            db_exec(sql)
-            success_count += 1
-        except Exception as e:
-            errors.append({"student": student['name'], "error": str(e)})
+    # Parse the INSERT once; each student only binds its values
+    insert_student = engine.prepare("""
+        INSERT INTO users (id, name, email, role, phone, address, date_of_birth, enrollment_date)
+        VALUES (?, ?, ?, 'Student', ?, ?, ?, ?)
+    """)
+    enrollment_date = datetime.now().strftime('%Y-%m-%d')
+    
+    # Successful rows are written to disk once, when the block exits
+    with engine.transaction():
+        for student in students:
+            try:
+                user_id = random.randint(1000, 99999)
+                result = insert_student.execute((
+                    user_id, student['name'], student['email'],
+                    student.get('phone', ''), student.get('address', ''),
+                    student.get('date_of_birth', '2005-01-01'), enrollment_date
+                ))
+                if not result['success']:
+                    raise ValueError(result['error'])
+                success_count += 1
+            except Exception as e:
+                errors.append({"student": student.get('name'), "error": str(e)})
     
     log_action("Admin", f"Bulk Import ({success_count} students)", "BULK INSERT INTO users")
     
@@ -4,10 +4,11 @@ Professional dashboard showcasing CRUD operations, analytics, and SQL execution
 Demonstrates both educational datasets and Kenyan HR analytics
 """
 
-from flask import Flask, render_template, request, jsonify
+from flask import Flask, Response, render_template, request, jsonify
 import sys
 import os
 from datetime import datetime
+import codecs
 import csv
 import io
 
@@ -87,6 +88,10 @@ def use_database():
     return jsonify(result), status
 
 
+# Quote escaping and comma removal in one str.translate pass
+_SQL_TEXT_TABLE = str.maketrans({"'": "''", ",": " "})
+
+
 def _sql_text(value) -> str:
     """Sanitize text for the project's simple SQL parser.
 
@@ -96,11 +101,8 @@ def _sql_text(value) -> str:
     """
     if value is None:
         return ''
-    text = str(value)
-    text = text.replace("'", "''")
-    text = text.replace(",", " ")
-    text = text.replace("\r", " ").replace("\n", " ")
-    return " ".join(text.split())
+    # split() also treats \r and \n as whitespace
+    return " ".join(str(value).translate(_SQL_TEXT_TABLE).split())
 
 
 def _next_int_id(table_name: str, id_column: str) -> int:
@@ -120,127 +122,171 @@ def _next_int_id(table_name: str, id_column: str) -> int:
     return (max(values) + 1) if values else 1
 
 
+# Seed departments for the analytics database: (dept_name, location)
+DEPARTMENTS = (
+    ('Engineering', 'Nairobi'),
+    ('Sales', 'Mombasa'),
+    ('Finance', 'Nairobi'),
+    ('Operations', 'Kisumu'),
+)
+
+
+def _bulk_insert(table_name: str, columns, rows, batch_size: int = 500) -> int:
+    """Load row tuples straight into storage with QueryEngine.copy_from.
+
+    No SQL text is built or parsed; rows are validated exactly as INSERTs
+    would be. Rows are loaded in size-capped batches. Returns the number of
+    rows inserted; a rejected batch is reported and stops seeding for that
+    table.
+    """
+    inserted = 0
+    for start in range(0, len(rows), batch_size):
+        result = engine.copy_from(table_name, columns, rows[start:start + batch_size])
+        if not result.get('success'):
+            print(f"⚠️  Seeding {table_name} failed: {result.get('error')}")
+            break
+        inserted += result.get('rows_affected', 0)
+    return inserted
+
+
 def init_databases():
     """Initialize both educational and analytics datasets"""
-    tables = engine.storage.list_tables()
-    
-    if 'students' not in tables:
-        print("📚 Initializing Educational Database...")
-        
-        # Create students table
-        engine.execute("""
-            CREATE TABLE students (
-                student_id INT PRIMARY KEY,
-                first_name VARCHAR(100),
-                last_name VARCHAR(100),
-                email VARCHAR(100) UNIQUE,
-                phone VARCHAR(20),
-                enrollment_date DATE
-            )
-        """)
-        
-        # Create courses table
-        engine.execute("""
-            CREATE TABLE courses (
-                course_id INT PRIMARY KEY,
-                course_name VARCHAR(100),
-                course_code VARCHAR(20) UNIQUE,
-                credits INT,
-                instructor VARCHAR(100)
-            )
-        """)
-        
-        # Create enrollments table (JUNCTION TABLE for M:M relationship)
-        engine.execute("""
-            CREATE TABLE enrollments (
-                enrollment_id INT PRIMARY KEY,
-                student_id INT,
-                course_id INT,
-                grade VARCHAR(2),
-                enrollment_date DATE,
-                FOREIGN KEY (student_id) REFERENCES students(student_id),
-                FOREIGN KEY (course_id) REFERENCES courses(course_id)
-            )
-        """)
-        
-        # Insert sample data
-        engine.execute("INSERT INTO students (student_id, first_name, last_name, email, phone, enrollment_date) VALUES (1, 'John', 'Doe', 'john.doe@university.edu', '+254712345678', '2023-01-15')")
-        engine.execute("INSERT INTO students (student_id, first_name, last_name, email, phone, enrollment_date) VALUES (2, 'Jane', 'Smith', 'jane.smith@university.edu', '+254723456789', '2023-02-20')")
-        engine.execute("INSERT INTO students (student_id, first_name, last_name, email, phone, enrollment_date) VALUES (3, 'James', 'Wilson', 'james.wilson@university.edu', '+254734567890', '2023-03-10')")
-        
-        engine.execute("INSERT INTO courses (course_id, course_name, course_code, credits, instructor) VALUES (1, 'Database Systems', 'CS301', 3, 'Dr. Samuel')")
-        engine.execute("INSERT INTO courses (course_id, course_name, course_code, credits, instructor) VALUES (2, 'Web Development', 'CS201', 3, 'Dr. Kipchoge')")
-        engine.execute("INSERT INTO courses (course_id, course_name, course_code, credits, instructor) VALUES (3, 'Data Structures', 'CS102', 4, 'Prof. Kariuki')")
-        
-        engine.execute("INSERT INTO enrollments (enrollment_id, student_id, course_id, grade, enrollment_date) VALUES (1, 1, 1, 'A', '2023-01-15')")
-        engine.execute("INSERT INTO enrollments (enrollment_id, student_id, course_id, grade, enrollment_date) VALUES (2, 1, 2, 'B', '2023-01-15')")
-        engine.execute("INSERT INTO enrollments (enrollment_id, student_id, course_id, grade, enrollment_date) VALUES (3, 2, 1, 'A', '2023-02-20')")
-        engine.execute("INSERT INTO enrollments (enrollment_id, student_id, course_id, grade, enrollment_date) VALUES (4, 3, 3, 'B', '2023-03-10')")
-        
-        # Create indexes
-        engine.execute("CREATE INDEX idx_student_email ON students(email)")
-        engine.execute("CREATE INDEX idx_course_code ON courses(course_code)")
-        engine.execute("CREATE INDEX idx_enrollment_student ON enrollments(student_id)")
-        
-        print("✅ Educational database initialized!")
-    
-    if 'employees' not in tables:
-        print("💼 Initializing Analytics Database...")
-        
-        # Create departments
-        engine.execute("""
-            CREATE TABLE departments (
-                dept_id INT PRIMARY KEY,
-                dept_name VARCHAR(100) UNIQUE,
-                location VARCHAR(100),
-                budget INT
-            )
-        """)
-        
-        # Create employees with FK
-        engine.execute("""
-            CREATE TABLE employees (
-                emp_id INT PRIMARY KEY,
-                name VARCHAR(100),
-                email VARCHAR(100) UNIQUE,
-                position VARCHAR(100),
-                salary INT,
-                dept_id INT,
-                FOREIGN KEY (dept_id) REFERENCES departments(dept_id)
-            )
-        """)
-        
-        # Sample departments
-        for i, (name, location) in enumerate([
-            ('Engineering', 'Nairobi'),
-            ('Sales', 'Mombasa'),
-            ('Finance', 'Nairobi'),
-            ('Operations', 'Kisumu')
-        ], 1):
-            engine.execute(f"INSERT INTO departments (dept_id, dept_name, location, budget) VALUES ({i}, '{name}', '{location}', {500000 + i*100000})")
-        
-        # Sample employees
-        employees = [
-            (1, 'Alice Kipchoge', 'alice@company.ke', 'Senior Engineer', 150000, 1),
-            (2, 'Bob Omondi', 'bob@company.ke', 'Sales Manager', 120000, 2),
-            (3, 'Carol Wanjiru', 'carol@company.ke', 'Finance Manager', 130000, 3),
-            (4, 'David Kimani', 'david@company.ke', 'Software Engineer', 95000, 1),
-            (5, 'Eve Kiplagat', 'eve@company.ke', 'Junior Engineer', 65000, 1),
-            (6, 'Frank Otieno', 'frank@company.ke', 'Sales Executive', 85000, 2),
-        ]
-        
-        for emp_id, name, email, position, salary, dept_id in employees:
-            engine.execute(f"INSERT INTO employees (emp_id, name, email, position, salary, dept_id) VALUES ({emp_id}, '{name}', '{email}', '{position}', {salary}, {dept_id})")
-        
-        print("✅ Analytics database initialized!")
-    
+    # One write per table for the whole seed; an exception discards the partial seed
+    with engine.transaction():
+        tables = engine.storage.list_tables()
+
+        if 'students' not in tables:
+            print("📚 Initializing Educational Database...")
+
+            # Create students table
+            engine.execute("""
+                CREATE TABLE students (
+                    student_id INT PRIMARY KEY,
+                    first_name VARCHAR(100),
+                    last_name VARCHAR(100),
+                    email VARCHAR(100) UNIQUE,
+                    phone VARCHAR(20),
+                    enrollment_date DATE
+                )
+            """)
+
+            # Create courses table
+            engine.execute("""
+                CREATE TABLE courses (
+                    course_id INT PRIMARY KEY,
+                    course_name VARCHAR(100),
+                    course_code VARCHAR(20) UNIQUE,
+                    credits INT,
+                    instructor VARCHAR(100)
+                )
+            """)
+
+            # Create enrollments table (JUNCTION TABLE for M:M relationship)
+            engine.execute("""
+                CREATE TABLE enrollments (
+                    enrollment_id INT PRIMARY KEY,
+                    student_id INT,
+                    course_id INT,
+                    grade VARCHAR(2),
+                    enrollment_date DATE,
+                    FOREIGN KEY (student_id) REFERENCES students(student_id),
+                    FOREIGN KEY (course_id) REFERENCES courses(course_id)
+                )
+            """)
+
+            # Insert sample data (loaded with copy_from, no SQL text)
+            _bulk_insert('students', ('student_id', 'first_name', 'last_name', 'email', 'phone', 'enrollment_date'), [
+                (1, 'John', 'Doe', 'john.doe@university.edu', '+254712345678', '2023-01-15'),
+                (2, 'Jane', 'Smith', 'jane.smith@university.edu', '+254723456789', '2023-02-20'),
+                (3, 'James', 'Wilson', 'james.wilson@university.edu', '+254734567890', '2023-03-10'),
+            ])
+
+            _bulk_insert('courses', ('course_id', 'course_name', 'course_code', 'credits', 'instructor'), [
+                (1, 'Database Systems', 'CS301', 3, 'Dr. Samuel'),
+                (2, 'Web Development', 'CS201', 3, 'Dr. Kipchoge'),
+                (3, 'Data Structures', 'CS102', 4, 'Prof. Kariuki'),
+            ])
+
+            _bulk_insert('enrollments', ('enrollment_id', 'student_id', 'course_id', 'grade', 'enrollment_date'), [
+                (1, 1, 1, 'A', '2023-01-15'),
+                (2, 1, 2, 'B', '2023-01-15'),
+                (3, 2, 1, 'A', '2023-02-20'),
+                (4, 3, 3, 'B', '2023-03-10'),
+            ])
+
+            # Create indexes
+            engine.execute("CREATE INDEX idx_student_email ON students(email)")
+            engine.execute("CREATE INDEX idx_course_code ON courses(course_code)")
+            engine.execute("CREATE INDEX idx_enrollment_student ON enrollments(student_id)")
+
+            print("✅ Educational database initialized!")
+
+        if 'employees' not in tables:
+            print("💼 Initializing Analytics Database...")
+
+            # Create departments
+            engine.execute("""
+                CREATE TABLE departments (
+                    dept_id INT PRIMARY KEY,
+                    dept_name VARCHAR(100) UNIQUE,
+                    location VARCHAR(100),
+                    budget INT
+                )
+            """)
+
+            # Create employees with FK
+            engine.execute("""
+                CREATE TABLE employees (
+                    emp_id INT PRIMARY KEY,
+                    name VARCHAR(100),
+                    email VARCHAR(100) UNIQUE,
+                    position VARCHAR(100),
+                    salary INT,
+                    dept_id INT,
+                    FOREIGN KEY (dept_id) REFERENCES departments(dept_id)
+                )
+            """)
+
+            # Sample departments
+            _bulk_insert('departments', ('dept_id', 'dept_name', 'location', 'budget'), [
+                (i, name, location, 500000 + i*100000)
+                for i, (name, location) in enumerate(DEPARTMENTS, 1)
+            ])
+
+            # Sample employees
+            _bulk_insert('employees', ('emp_id', 'name', 'email', 'position', 'salary', 'dept_id'), [
+                (1, 'Alice Kipchoge', 'alice@company.ke', 'Senior Engineer', 150000, 1),
+                (2, 'Bob Omondi', 'bob@company.ke', 'Sales Manager', 120000, 2),
+                (3, 'Carol Wanjiru', 'carol@company.ke', 'Finance Manager', 130000, 3),
+                (4, 'David Kimani', 'david@company.ke', 'Software Engineer', 95000, 1),
+                (5, 'Eve Kiplagat', 'eve@company.ke', 'Junior Engineer', 65000, 1),
+                (6, 'Frank Otieno', 'frank@company.ke', 'Sales Executive', 85000, 2),
+            ])
+
+            print("✅ Analytics database initialized!")
+
     engine_status['initialized'] = True
 
 
+# Rendered HTML of templates that take no context, by template name
+_static_pages = {}
+
+
+def _render_static(template_name: str) -> str:
+    """Render a context-free template once and reuse the HTML afterwards"""
+    html = _static_pages.get(template_name)
+    if html is None:
+        html = render_template(template_name)
+        # In debug mode keep re-rendering so template edits show up
+        if not app.debug:
+            _static_pages[template_name] = html
+    return html
+
+
 @app.route('/')
 def index():
     """Render the gateway homepage with entry points"""
-    return render_template('index.html')
+    return _render_static('index.html')
 
 
 @app.route('/school')
@@ -254,7 +300,7 @@ def studio():
     """Render the main studio dashboard"""
     if not engine_status['initialized']:
         init_databases()
-    return render_template('studio.html')
+    return _render_static('studio.html')
 
 
 # ============ CRUD ENDPOINTS ============
@@ -529,16 +575,35 @@ def get_analytics_employees():
 def get_salary_analytics():
     """Get salary statistics by department"""
     try:
+        # Aggregate directly on employees.dept_id (no JOIN operator), then map the
+        # handful of department names client-side from a single lookup query.
         result = engine.execute("""
-            SELECT d.dept_name, COUNT(*) as emp_count, AVG(e.salary) as avg_salary, 
-                   MAX(e.salary) as max_salary, MIN(e.salary) as min_salary
-            FROM employees e
-            INNER JOIN departments d ON e.dept_id = d.dept_id
-            GROUP BY d.dept_id
+            SELECT dept_id, COUNT(*) as emp_count, AVG(salary) as avg_salary,
+                   MAX(salary) as max_salary, MIN(salary) as min_salary
+            FROM employees
+            GROUP BY dept_id
         """)
-        if not result.get('success'):
-            return jsonify({'success': False, 'error': result.get('error', 'Query failed')}), 400
-        return jsonify({'success': True, 'data': result.get('rows', [])})
+        dep = engine.execute("SELECT dept_id, dept_name FROM departments")
+        for r in (result, dep):
+            if not r.get('success'):
+                return jsonify({'success': False, 'error': r.get('error', 'Query failed')}), 400
+
+        dept_name_by_id = {row.get('dept_id'): row.get('dept_name') for row in dep.get('rows', [])}
+        data = []
+        for row in result.get('rows', []):
+            dept_id = row.get('dept_id')
+            if dept_id not in dept_name_by_id:
+                # Preserve INNER JOIN semantics: skip employees without a department
+                continue
+            data.append({
+                'dept_name': dept_name_by_id[dept_id],
+                'emp_count': row.get('emp_count'),
+                'avg_salary': row.get('avg_salary'),
+                'max_salary': row.get('max_salary'),
+                'min_salary': row.get('min_salary'),
+            })
+
+        return jsonify({'success': True, 'data': data})
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
@@ -600,12 +665,55 @@ def explain_sql():
         }), 500
 
 
+# Schema payloads by endpoint, as (storage, schema_version, payload).
+# Reused until the current database or its tables/indexes change.
+_schema_cache = {}
+
+
+def _cached_schema(key: str, build):
+    """Return build()'s result, rebuilding only after a schema change"""
+    storage = engine.storage
+    entry = _schema_cache.get(key)
+    if entry is None or entry[0] is not storage or entry[1] != storage.schema_version:
+        entry = (storage, storage.schema_version, build())
+        _schema_cache[key] = entry
+    return entry[2]
+
+
+def _build_full_schema():
+    """Describe every table's columns and foreign keys for the ERD"""
+    schema = []
+    for table_name in engine.storage.list_tables():
+        table_def = engine.storage.get_table(table_name)
+        columns = []
+        for col in table_def.columns:
+            col_data = {
+                'name': col.name,
+                'type': col.data_type.value,
+                'is_pk': col.primary_key,
+                'is_fk': bool(col.foreign_key)
+            }
+            if col.foreign_key:
+                col_data['fk_target'] = {
+                    'table': col.foreign_key[0],
+                    'column': col.foreign_key[1]
+                }
+            columns.append(col_data)
+        
+        schema.append({
+            'table_name': table_name,
+            'columns': columns
+        })
+    return schema
+
+
 @app.route('/api/schema', methods=['GET'])
 def get_schema():
     """Get database schema information"""
     try:
+        # Row counts change with every write, so only the index list is cached
         tables_info = engine.storage.get_system_tables_info()
-        indexes_info = engine.storage.get_system_indexes_info()
+        indexes_info = _cached_schema('indexes', engine.storage.get_system_indexes_info)
         
         return jsonify({
             'success': True,
@@ -620,35 +728,10 @@ def get_schema():
 def get_full_schema():
     """Get complete schema with foreign keys for ERD generation"""
     try:
-        tables = engine.storage.list_tables()
-        schema = []
-        
-        for table_name in tables:
-            table_def = engine.storage.get_table(table_name)
-            columns = []
-            for col in table_def.columns:
-                col_data = {
-                    'name': col.name,
-                    'type': col.data_type.value,
-                    'is_pk': col.primary_key,
-                    'is_fk': bool(col.foreign_key)
-                }
-                if col.foreign_key:
-                    col_data['fk_target'] = {
-                        'table': col.foreign_key[0],
-                        'column': col.foreign_key[1]
-                    }
-                columns.append(col_data)
-            
-            schema.append({
-                'table_name': table_name,
-                'columns': columns
-            })
-            
         return jsonify({
             'success': True,
             'database': engine.current_database,
-            'schema': schema
+            'schema': _cached_schema('full', _build_full_schema)
         })
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
@@ -671,7 +754,6 @@ def get_engine_status():
 def get_tables():
     """Get all tables with metadata"""
     try:
-        tables = engine.storage.list_tables()
         tables_info = engine.storage.get_system_tables_info()
         
         result = []
@@ -699,7 +781,7 @@ def get_table_rows(table_name):
     """Fetch all rows for a specific table."""
     try:
         # Check if table exists
-        if table_name not in engine.storage.list_tables():
+        if engine.storage.get_table(table_name) is None:
              return jsonify({'success': False, 'error': f"Table '{table_name}' does not exist"}), 404
 
         result = engine.execute(f"SELECT * FROM {table_name}")
@@ -903,13 +985,57 @@ def create_table():
 
 
 
+# Rows written per CSV chunk when exporting
+EXPORT_CHUNK_ROWS = 1000
+
+# Parsed CSV rows handed to copy_from per batch when importing
+IMPORT_BATCH_ROWS = 1000
+
+
+def _csv_chunks(rows, headers):
+    """Yield the CSV text for rows a chunk of EXPORT_CHUNK_ROWS rows at a time
+
+    rows must be a snapshot (a SELECT result), not the live table list: the
+    response is still being generated after the request returns.
+    """
+    output = io.StringIO()
+    writer = csv.writer(output)
+    writer.writerow(headers)
+    for start in range(0, len(rows), EXPORT_CHUNK_ROWS):
+        for row in rows[start:start + EXPORT_CHUNK_ROWS]:
+            writer.writerow([row.get(col) for col in headers])
+        yield output.getvalue()
+        output.seek(0)
+        output.truncate()
+    yield output.getvalue()
+
+
+def _csv_batches(reader, cols):
+    """Yield the parsed value tuples of a CSV reader IMPORT_BATCH_ROWS at a time"""
+    batch = []
+    for row in reader:
+        # Simple sanitization/conversion: empty cells and NULL become None
+        batch.append(tuple(None if row[c] in (None, '') or row[c].upper() == 'NULL' else row[c] for c in cols))
+        if len(batch) == IMPORT_BATCH_ROWS:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
 @app.route('/api/table/<table_name>/export', methods=['GET'])
 def export_table_csv(table_name):
-    """Export table data as CSV"""
+    """Export table data as CSV
+
+    Returns JSON with the whole file in 'csv' by default. With ?format=csv
+    the SELECT result is written as a text/csv body in chunks of
+    EXPORT_CHUNK_ROWS, so the file is never built as one string.
+    """
     try:
-        if table_name not in engine.storage.list_tables():
+        if engine.storage.get_table(table_name) is None:
             return jsonify({'success': False, 'error': f"Table '{table_name}' does not exist"}), 404
             
+        # The result is a snapshot: writes during the download can't shift it
         result = engine.execute(f"SELECT * FROM {table_name}")
         if not result.get('success'):
             return jsonify({'success': False, 'error': result.get('error', 'Query failed')}), 400
@@ -918,21 +1044,20 @@ def export_table_csv(table_name):
         if not rows:
             return jsonify({'success': False, 'error': 'No data to export'}), 400
             
-        output = io.StringIO()
-        writer = csv.writer(output)
-        
-        # Header
         headers = list(rows[0].keys())
-        writer.writerow(headers)
+        filename = f"{table_name}_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
         
-        # Rows
-        for row in rows:
-            writer.writerow([row.get(col) for col in headers])
+        if request.args.get('format') == 'csv':
+            return Response(
+                _csv_chunks(rows, headers),
+                mimetype='text/csv',
+                headers={'Content-Disposition': f'attachment; filename={filename}'}
+            )
             
         return jsonify({
             'success': True,
-            'csv': output.getvalue(),
-            'filename': f"{table_name}_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+            'csv': ''.join(_csv_chunks(rows, headers)),
+            'filename': filename
         })
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
@@ -940,67 +1065,58 @@ def export_table_csv(table_name):
 
 @app.route('/api/table/<table_name>/import', methods=['POST'])
 def import_table_csv(table_name):
-    """Import CSV data into table"""
+    """Import CSV data into table
+
+    Accepts JSON {"csv": "..."} or a raw text/csv body, which may be sent
+    with chunked transfer encoding. The body is parsed as it is read and
+    loaded IMPORT_BATCH_ROWS rows at a time, in one transaction.
+    """
     try:
-        data = request.json or {}
-        csv_content = data.get('csv', '')
-        
-        if not csv_content:
-            return jsonify({'success': False, 'error': 'No CSV content provided'}), 400
+        if request.mimetype == 'text/csv':
+            # Parse the body as it is read instead of holding it as one string
+            lines = codecs.iterdecode(request.stream, 'utf-8')
+        else:
+            data = request.json or {}
+            csv_content = data.get('csv', '')
+            
+            if not csv_content:
+                return jsonify({'success': False, 'error': 'No CSV content provided'}), 400
+            lines = io.StringIO(csv_content)
             
         table_def = engine.storage.get_table(table_name)
         if not table_def:
              return jsonify({'success': False, 'error': f"Table '{table_name}' does not exist"}), 404
              
         # Parse CSV
-        f = io.StringIO(csv_content)
-        reader = csv.DictReader(f)
+        reader = csv.DictReader(lines)
+        
+        # Map CSV columns to table columns
+        # This implementation assumes CSV headers match column names
+        header = set(reader.fieldnames or [])
+        cols = [col.name for col in table_def.columns if col.name in header]
         
         success_count = 0
         errors = []
         
-        for i, row in enumerate(reader):
-            # Map CSV columns to table columns
-            # This implementation assumes CSV headers match column names
-            
-            # Simple sanitization/conversion
-            insert_data = {}
-            for col in table_def.columns:
-                if col.name in row:
-                    val = row[col.name]
-                    # Handle NULLs
-                    if val == '' or val.upper() == 'NULL':
-                        insert_data[col.name] = None
+        if cols:
+            # The table is written once, after the last batch
+            with engine.transaction():
+                row_offset = 0
+                for batch in _csv_batches(reader, cols):
+                    # Fast path: load the batch without building SQL text
+                    res = engine.copy_from(table_name, cols, batch)
+                    if res.get('success'):
+                        success_count += res.get('rows_affected', 0)
                     else:
-                        insert_data[col.name] = val
-            
-            if not insert_data:
-                continue
-                
-            # Construct insert query (reusing logic would be better but keeping it simple)
-            cols = list(insert_data.keys())
-            vals = []
-            
-            for col_name in cols:
-                val = insert_data[col_name]
-                if isinstance(val, str):
-                    safe_val = _sql_text(val)
-                    vals.append(f"'{safe_val}'")
-                elif val is None:
-                    vals.append("NULL")
-                else:
-                     vals.append(str(val))
-
-            col_str = ", ".join(cols)
-            val_str = ", ".join(vals)
-            
-            query = f"INSERT INTO {table_name} ({col_str}) VALUES ({val_str})"
-            res = engine.execute(query)
-            
-            if res.get('success'):
-                success_count += 1
-            else:
-                errors.append(f"Row {i+1}: {res.get('error')}")
+                        # Some row was rejected; retry this batch row by row
+                        # to import the valid ones and report which failed
+                        for i, values in enumerate(batch, row_offset + 1):
+                            res = engine.copy_from(table_name, cols, [values])
+                            if res.get('success'):
+                                success_count += 1
+                            else:
+                                errors.append(f"Row {i}: {res.get('error')}")
+                    row_offset += len(batch)
                 
         return jsonify({
             'success': True,